@@ -0,0 +1,122 @@
+from fastapi import APIRouter, Depends, Header, HTTPException, Query, status
+from fastapi.responses import StreamingResponse
+from sqlalchemy.ext.asyncio import AsyncEngine
+
+from src.core.database import get_db_engines, health_monitors
+from src.core.enums import ErrorMessages, ExportFormat
+from src.core.security import is_admin_token
+from src.wallet.export import stream_wallets, uuid_ranges
+from src.wallet.hotkeys import HotWallet, hot_wallets
+from src.wallet.membership import wallet_membership
+from src.wallet.schemas import (
+    DatabaseHealthEntry,
+    HotWalletEntry,
+    HotWalletsResponse,
+    MembershipFilterResponse,
+)
+
+
+async def require_admin(x_admin_token: str | None = Header(default=None)) -> None:
+    if not is_admin_token(x_admin_token):
+        raise HTTPException(
+            status_code=status.HTTP_403_FORBIDDEN,
+            detail=ErrorMessages.FORBIDDEN
+        )
+
+
+router = APIRouter(prefix="/admin", tags=["admin"], dependencies=[Depends(require_admin)])
+
+
+@router.get(
+    "/hot-wallets",
+    response_model=HotWalletsResponse,
+    summary="Горячие кошельки",
+    description="Топ кошельков по частоте запросов и по суммарному ожиданию блокировок строк"
+)
+async def get_hot_wallets(
+    limit: int = Query(default=10, ge=1, le=100),
+    window: int = Query(default=60, ge=1, le=hot_wallets.max_window_seconds, description="Окно, секунд"),
+) -> HotWalletsResponse:
+    """Получить горячие кошельки за окно."""
+    by_requests, by_lock_wait = hot_wallets.top(limit, window)
+
+    def to_entry(item: HotWallet) -> HotWalletEntry:
+        return HotWalletEntry(
+            wallet_uuid=item.wallet_uuid,
+            requests=round(item.requests),
+            requests_per_second=item.requests / window,
+            lock_wait_seconds=item.lock_wait_seconds,
+        )
+
+    return HotWalletsResponse(
+        window_seconds=window,
+        by_requests=[to_entry(item) for item in by_requests],
+        by_lock_wait=[to_entry(item) for item in by_lock_wait],
+    )
+
+
+@router.get(
+    "/wallets/export",
+    summary="Выгрузка балансов",
+    description="Потоковая выгрузка балансов всех кошельков в CSV/NDJSON; "
+                "пространство UUID можно разбить на части и выгружать их параллельно"
+)
+async def export_wallets(
+    format: ExportFormat = Query(default=ExportFormat.CSV),
+    gzip: bool = Query(default=False),
+    part: int = Query(default=0, ge=0, description="Номер части"),
+    parts: int = Query(default=1, ge=1, le=256, description="Число частей"),
+    shard_engines: dict[str, AsyncEngine] = Depends(get_db_engines),
+) -> StreamingResponse:
+    """Выгрузить балансы кошельков."""
+    if part >= parts:
+        raise HTTPException(
+            status_code=status.HTTP_400_BAD_REQUEST,
+            detail=ErrorMessages.INVALID_REQUEST_DATA
+        )
+
+    filename = f"wallets.{format}" if parts == 1 else f"wallets.part-{part:03d}.{format}"
+    media_type = "text/csv" if format is ExportFormat.CSV else "application/x-ndjson"
+    if gzip:
+        filename += ".gz"
+        media_type = "application/gzip"
+
+    return StreamingResponse(
+        stream_wallets(shard_engines, format, uuid_ranges(parts)[part], compress=gzip),
+        media_type=media_type,
+        headers={"Content-Disposition": f'attachment; filename="{filename}"'},
+    )
+
+
+@router.get(
+    "/membership-filter",
+    response_model=MembershipFilterResponse,
+    summary="Фильтр существующих кошельков",
+    description="Заполнение, размер, оценка ложноположительных ответов и время сборки фильтра"
+)
+async def get_membership_filter() -> MembershipFilterResponse:
+    """Получить состояние фильтра кошельков."""
+    return MembershipFilterResponse.model_validate(wallet_membership.stats())
+
+
+@router.get(
+    "/db-health",
+    response_model=list[DatabaseHealthEntry],
+    summary="Доступность БД",
+    description="Состояние автоматов доступности шардов, экономия на pre-ping и время восстановления после сбоя"
+)
+async def get_db_health() -> list[DatabaseHealthEntry]:
+    """Получить состояние мониторов БД."""
+    return [
+        DatabaseHealthEntry(
+            shard_id=shard_id,
+            state=monitor.breaker.state,
+            failures=monitor.breaker.failures,
+            checks=monitor.checks,
+            ping_ms=monitor.ping_seconds * 1000 if monitor.ping_seconds is not None else None,
+            skipped_pre_pings=monitor.skipped_pre_pings,
+            estimated_saved_ms=monitor.estimated_saved_seconds * 1000,
+            last_recovery_seconds=monitor.breaker.last_recovery_seconds,
+        )
+        for shard_id, monitor in health_monitors.items()
+    ]
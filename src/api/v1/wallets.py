@@ -1,12 +1,21 @@
 import uuid
 
 import structlog
-from fastapi import APIRouter, Depends, HTTPException, status
-from sqlalchemy.ext.asyncio import AsyncSession
+from fastapi import APIRouter, Depends, HTTPException, Query, Request, status
+from fastapi.responses import StreamingResponse
+from sqlalchemy.ext.asyncio import AsyncSession, async_sessionmaker
 
-from src.core.database import get_db_session
+from src.core.config import settings
+from src.core.database import get_db_session, get_session_factory
 from src.core.enums import OperationType, ErrorMessages
-from src.core.exceptions import WalletNotFoundError, InsufficientFundsError
+from src.core.exceptions import (
+    WalletNotFoundError,
+    InsufficientFundsError,
+    DatabaseUnavailableError,
+    InvalidCheckpointError,
+)
+from src.wallet.ingest import ingest_operations, parse_checkpoint
+from src.wallet.hotkeys import hot_wallets
 from src.wallet.services import WalletService
 from src.wallet.schemas import WalletOperationRequest, WalletResponse
 
@@ -31,6 +40,7 @@ async def perform_operation(
     wallet_service: WalletService = Depends(get_wallet_service)
 ) -> WalletResponse:
     """Выполнить операцию с кошельком."""
+    hot_wallets.record_request(wallet_uuid)
     try:
         match operation.operation_type:
             case OperationType.DEPOSIT:
@@ -53,6 +63,11 @@ async def perform_operation(
             status_code=status.HTTP_400_BAD_REQUEST,
             detail=ErrorMessages.INSUFFICIENT_FUNDS
         )
+    except DatabaseUnavailableError:
+        raise HTTPException(
+            status_code=status.HTTP_503_SERVICE_UNAVAILABLE,
+            detail=ErrorMessages.SERVICE_UNAVAILABLE
+        )
     except Exception as e:
         logger.error("Необработанная ошибка", error=str(e), exc_info=True)
         raise HTTPException(
@@ -61,6 +76,38 @@ async def perform_operation(
         )
 
 
+@router.post(
+    "/operations/stream",
+    summary="Потоковая загрузка операций",
+    description="Применить операции из тела в формате NDJSON (по одной WalletOperationLine на строку) "
+                "и вернуть поток результатов по строкам с токенами продолжения после каждой пачки"
+)
+async def ingest_operations_stream(
+    request: Request,
+    checkpoint: str | None = Query(default=None, description="Токен продолжения прерванной загрузки"),
+    session_factory: async_sessionmaker[AsyncSession] = Depends(get_session_factory)
+) -> StreamingResponse:
+    """Потоково загрузить операции."""
+    try:
+        upload_id = parse_checkpoint(checkpoint) if checkpoint else uuid.uuid4()
+    except InvalidCheckpointError:
+        raise HTTPException(
+            status_code=status.HTTP_400_BAD_REQUEST,
+            detail=ErrorMessages.INVALID_CHECKPOINT
+        )
+
+    return StreamingResponse(
+        ingest_operations(
+            session_factory,
+            request.stream(),
+            upload_id,
+            chunk_size=settings.ingest_chunk_size,
+            max_line_bytes=settings.ingest_max_line_bytes,
+        ),
+        media_type="application/x-ndjson",
+    )
+
+
 @router.get(
     "/{wallet_uuid}",
     response_model=WalletResponse,
@@ -72,6 +119,7 @@ async def get_wallet_balance(
     wallet_service: WalletService = Depends(get_wallet_service)
 ) -> WalletResponse:
     """Получить баланс кошелька."""
+    hot_wallets.record_request(wallet_uuid)
     try:
         wallet = await wallet_service.get_wallet(wallet_uuid)
         
@@ -86,6 +134,12 @@ async def get_wallet_balance(
             detail=ErrorMessages.WALLET_NOT_FOUND
         )
 
+    except DatabaseUnavailableError:
+        raise HTTPException(
+            status_code=status.HTTP_503_SERVICE_UNAVAILABLE,
+            detail=ErrorMessages.SERVICE_UNAVAILABLE
+        )
+
     except Exception as e:
         logger.error("Ошибка при получении баланса кошелька", error=str(e), exc_info=True)
         raise HTTPException(
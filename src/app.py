@@ -1,13 +1,43 @@
+import asyncio
+from collections.abc import AsyncIterator
+from contextlib import asynccontextmanager
+
 import structlog
-from fastapi import FastAPI
+from fastapi import FastAPI, Request, status
+from fastapi.responses import JSONResponse
 
 from src.core.config import settings
+from src.core.database import engines, health_monitors
+from src.core.enums import ErrorMessages
+from src.core.exceptions import DatabaseUnavailableError
 from src.core.logging import configure_logging
+from src.core.profiling import ProfilingMiddleware, instrument_engine
+from src.api.v1.admin import router as admin_router
 from src.api.v1.wallets import router as wallets_router
+from src.wallet.membership import wallet_membership
 
 logger = structlog.get_logger()
 
 
+@asynccontextmanager
+async def lifespan(app: FastAPI) -> AsyncIterator[None]:
+    # Фоновые задачи живут, пока работает приложение
+    background_tasks = []
+    if settings.db_health_monitor_enabled:
+        background_tasks.extend(asyncio.create_task(monitor.run()) for monitor in health_monitors.values())
+    if settings.membership_filter_enabled:
+        background_tasks.append(asyncio.create_task(
+            wallet_membership.run(engines, settings.membership_filter_rebuild_interval)
+        ))
+
+    try:
+        yield
+    finally:
+        for task in background_tasks:
+            task.cancel()
+        await asyncio.gather(*background_tasks, return_exceptions=True)
+
+
 def create_app() -> FastAPI:
     # Конфигурация логирования
     configure_logging(settings)
@@ -16,8 +46,22 @@ def create_app() -> FastAPI:
     app = FastAPI(
         title=settings.app_name,
         version=settings.app_version,
-        debug=settings.debug
+        debug=settings.debug,
+        lifespan=lifespan
     )
+
+    # Учет времени запросов: Server-Timing, структурный лог, выборочные профили
+    for engine in engines.values():
+        instrument_engine(engine)
+    app.add_middleware(ProfilingMiddleware)
+
+    # БД недоступна (автомат открыт): отвечаем сразу, не занимая пул
+    @app.exception_handler(DatabaseUnavailableError)
+    async def database_unavailable_handler(request: Request, exc: DatabaseUnavailableError) -> JSONResponse:
+        return JSONResponse(
+            status_code=status.HTTP_503_SERVICE_UNAVAILABLE,
+            content={"detail": ErrorMessages.SERVICE_UNAVAILABLE}
+        )
     
     # Healthcheck endpoint
     @app.get("/ping", summary="Healthcheck", tags=["health"])
@@ -26,6 +70,7 @@ def create_app() -> FastAPI:
 
     # Подключение роутеров
     app.include_router(wallets_router, prefix="/api/v1")
+    app.include_router(admin_router, prefix="/api/v1")
 
     return app
 
@@ -29,6 +29,41 @@ class Settings(BaseSettings):
     pool_timeout: int = 30  # seconds
     pool_recycle: int = 1800  # seconds
     pool_pre_ping: bool = True
+
+    # Фоновая проверка БД (заменяет pre-ping) и автомат отказа при недоступности
+    db_health_monitor_enabled: bool = True
+    db_health_check_interval: float = 1.0  # seconds
+    db_health_check_timeout: float = 2.0  # seconds
+    db_circuit_failure_threshold: int = 2
+    db_circuit_reset_timeout: float = 5.0  # seconds
+
+    # Шардирование: имя шарда -> URL базы данных (пусто - одна база)
+    db_shards: dict[str, str] = {}
+    # Шарды кольца до решардинга (задаются на время переноса кошельков)
+    db_shards_previous: list[str] = []
+    shard_vnodes: int = 64
+
+    # Токен для admin-эндпоинтов (заголовок X-Admin-Token). Не задан - admin API отключен
+    admin_token: str | None = None
+
+    # Горячие кошельки: размер счетчиков и скользящее окно (интервалы по N секунд)
+    hot_wallets_capacity: int = 64
+    hot_wallets_bucket_seconds: int = 10
+    hot_wallets_buckets: int = 90
+
+    # Фильтр существующих кошельков: 404 для неизвестных UUID без запроса в БД
+    membership_filter_enabled: bool = False
+    membership_filter_error_rate: float = 0.001
+    membership_filter_rebuild_interval: int = 300  # seconds
+
+    # Профилирование: доля запросов, профилируемых cProfile (также по заголовку
+    # X-Profile с токеном администратора), и каталог для профилей
+    profiling_sample_rate: float = 0.0
+    profiling_dir: str = "profiles"
+
+    # Потоковая загрузка операций (NDJSON): строк в транзакции и максимальная длина строки
+    ingest_chunk_size: int = 500
+    ingest_max_line_bytes: int = 4096
     
     @property
     def database_url(self) -> str:
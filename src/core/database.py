@@ -1,32 +1,91 @@
 from typing import AsyncGenerator
 
-from sqlalchemy.ext.asyncio import AsyncSession, create_async_engine, async_sessionmaker
+from sqlalchemy.ext.asyncio import AsyncEngine, AsyncSession, create_async_engine, async_sessionmaker
 
 from src.core.config import settings
+from src.core.exceptions import DatabaseUnavailableError
+from src.core.health import CircuitBreaker, DatabaseHealthMonitor
+from src.core.sharding import DEFAULT_SHARD, ShardRouter
 
-# Создание async engine с настраиваемым пулом (в тестах переопределяется)
-engine = create_async_engine(
-    settings.database_url,
-    echo=False,
-    pool_size=settings.pool_size,
-    max_overflow=settings.max_overflow,
-    pool_timeout=settings.pool_timeout,
-    pool_recycle=settings.pool_recycle,
-    pool_pre_ping=settings.pool_pre_ping,
-)
-
-# Создание фабрики сессий
-async_session_factory = async_sessionmaker(
-    engine,
-    class_=AsyncSession,
-    expire_on_commit=False
-)
+
+def create_engine(url: str) -> AsyncEngine:
+    """Создать async engine с настраиваемым пулом."""
+    return create_async_engine(
+        url,
+        echo=False,
+        pool_size=settings.pool_size,
+        max_overflow=settings.max_overflow,
+        pool_timeout=settings.pool_timeout,
+        pool_recycle=settings.pool_recycle,
+        # Фоновый монитор проверяет подключения вместо pre-ping при каждой выдаче
+        pool_pre_ping=settings.pool_pre_ping and not settings.db_health_monitor_enabled,
+    )
+
+
+def create_health_monitor(shard_id: str, shard_engine: AsyncEngine) -> DatabaseHealthMonitor:
+    """Создать монитор доступности шарда."""
+    return DatabaseHealthMonitor(
+        shard_id,
+        shard_engine,
+        CircuitBreaker(settings.db_circuit_failure_threshold, settings.db_circuit_reset_timeout),
+        interval=settings.db_health_check_interval,
+        timeout=settings.db_health_check_timeout,
+        replaces_pre_ping=settings.pool_pre_ping and settings.db_health_monitor_enabled,
+    )
+
+
+def is_shard_available(shard_id: str) -> bool:
+    """Проверить, что автомат доступности шарда закрыт."""
+    return health_monitors[shard_id].breaker.allow_request()
+
+
+# Engine и фабрика сессий (в тестах переопределяются).
+# При заданных шардах у каждого шарда свой пул, а сессия маршрутизирует запросы сама.
+if settings.db_shards:
+    engines: dict[str, AsyncEngine] = {
+        shard_id: create_engine(url) for shard_id, url in settings.db_shards.items()
+    }
+    shard_router: ShardRouter | None = ShardRouter(
+        engines,
+        previous_shard_ids=settings.db_shards_previous or None,
+        vnodes=settings.shard_vnodes,
+        is_available=is_shard_available,
+    )
+    engine = engines[shard_router.default_shard]
+    async_session_factory = shard_router.session_factory(engines)
+else:
+    engine = create_engine(settings.database_url)
+    engines = {DEFAULT_SHARD: engine}
+    shard_router = None
+    async_session_factory = async_sessionmaker(
+        engine,
+        class_=AsyncSession,
+        expire_on_commit=False
+    )
+
+health_monitors = {
+    shard_id: create_health_monitor(shard_id, shard_engine) for shard_id, shard_engine in engines.items()
+}
 
 
 async def get_db_session() -> AsyncGenerator[AsyncSession, None]:
     """Получить сессию базы данных."""
+    # Шардированная сессия проверяет доступность каждого шарда сама
+    if shard_router is None and not is_shard_available(DEFAULT_SHARD):
+        raise DatabaseUnavailableError("База данных недоступна")
+
     async with async_session_factory() as session:
         try:
             yield session
         finally:
             await session.close()
+
+
+async def get_session_factory() -> async_sessionmaker[AsyncSession]:
+    """Получить фабрику сессий (для обработчиков, живущих дольше зависимостей запроса)."""
+    return async_session_factory
+
+
+async def get_db_engines() -> dict[str, AsyncEngine]:
+    """Получить engines всех шардов."""
+    return engines
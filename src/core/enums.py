@@ -6,8 +6,28 @@ class OperationType(StrEnum):
     WITHDRAW = "WITHDRAW"
 
 
+class ExportFormat(StrEnum):
+    CSV = "csv"
+    NDJSON = "ndjson"
+
+
+class IngestLineStatus(StrEnum):
+    OK = "ok"
+    ERROR = "error"
+
+
+class CircuitState(StrEnum):
+    CLOSED = "closed"
+    OPEN = "open"
+    HALF_OPEN = "half_open"
+
+
 class ErrorMessages(StrEnum):
     WALLET_NOT_FOUND = "Wallet not found"
     INSUFFICIENT_FUNDS = "Insufficient funds"
     INTERNAL_SERVER_ERROR = "Internal server error"
     INVALID_REQUEST_DATA = "Invalid request data"
+    FORBIDDEN = "Forbidden"
+    SERVICE_UNAVAILABLE = "Service unavailable"
+    INVALID_CHECKPOINT = "Invalid checkpoint"
+    LINE_TOO_LONG = "Line too long"
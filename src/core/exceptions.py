@@ -9,3 +9,15 @@ class InsufficientFundsError(Exception):
 
 class InvalidOperationError(Exception):
     pass
+
+
+class DatabaseUnavailableError(Exception):
+    pass
+
+
+class InvalidCheckpointError(Exception):
+    pass
+
+
+class IngestConflictError(Exception):
+    pass
@@ -0,0 +1,152 @@
+import asyncio
+import time
+from collections.abc import Callable
+
+import structlog
+from sqlalchemy import event, text
+from sqlalchemy.ext.asyncio import AsyncEngine
+from sqlalchemy.pool import QueuePool
+
+from src.core.enums import CircuitState
+
+logger = structlog.get_logger()
+
+
+class CircuitBreaker:
+    """Автомат доступности БД: закрыт - запросы идут, открыт - отклоняются сразу.
+
+    После ``reset_timeout`` открытый автомат переходит в полуоткрытое
+    состояние: запросы по-прежнему отклоняются, а первая успешная проверка
+    монитора закрывает его.
+    """
+
+    def __init__(self, failure_threshold: int, reset_timeout: float, clock: Callable[[], float] = time.monotonic):
+        self.failure_threshold = failure_threshold
+        self.reset_timeout = reset_timeout
+        self.clock = clock
+        self.state = CircuitState.CLOSED
+        self.failures = 0
+        self.opened_at = 0.0
+        self.outage_started = 0.0
+        self.last_recovery_seconds: float | None = None
+
+    def allow_request(self) -> bool:
+        return self.state is CircuitState.CLOSED
+
+    def allow_probe(self) -> bool:
+        if self.state is CircuitState.OPEN and self.clock() - self.opened_at >= self.reset_timeout:
+            self.state = CircuitState.HALF_OPEN
+        return self.state is not CircuitState.OPEN
+
+    def record_success(self) -> bool:
+        """Учесть успешную проверку. Возвращает True, если автомат закрылся."""
+        self.failures = 0
+        if self.state is CircuitState.CLOSED:
+            return False
+
+        self.state = CircuitState.CLOSED
+        self.last_recovery_seconds = self.clock() - self.outage_started
+        return True
+
+    def record_failure(self) -> bool:
+        """Учесть неудачную проверку. Возвращает True, если автомат открылся."""
+        self.failures += 1
+        now = self.clock()
+
+        if self.state is CircuitState.HALF_OPEN:
+            self.state = CircuitState.OPEN
+            self.opened_at = now
+            return False
+
+        if self.state is CircuitState.CLOSED and self.failures >= self.failure_threshold:
+            self.state = CircuitState.OPEN
+            self.opened_at = self.outage_started = now
+            return True
+
+        return False
+
+
+class DatabaseHealthMonitor:
+    """Фоновая проверка БД вместо pre-ping при каждой выдаче подключения из пула.
+
+    Каждая проверка по очереди пингует все простаивающие подключения пула
+    (очередь пула FIFO, поэтому последовательные выдачи перебирают их все)
+    и управляет автоматом доступности шарда.
+    """
+
+    def __init__(
+        self,
+        shard_id: str,
+        engine: AsyncEngine,
+        breaker: CircuitBreaker,
+        interval: float,
+        timeout: float,
+        replaces_pre_ping: bool = False,
+    ):
+        self.shard_id = shard_id
+        self.engine = engine
+        self.breaker = breaker
+        self.interval = interval
+        self.timeout = timeout
+        self.ping_seconds: float | None = None
+        self.checks = 0
+        self.checkouts = 0
+        self.probe_checkouts = 0
+
+        if replaces_pre_ping:
+            event.listen(engine.sync_engine.pool, "checkout", self._count_checkout)
+
+    def _count_checkout(self, dbapi_connection, connection_record, connection_proxy) -> None:
+        self.checkouts += 1
+
+    @property
+    def skipped_pre_pings(self) -> int:
+        """Число выдач подключений из пула без pre-ping (кроме проверок самого монитора)."""
+        return max(self.checkouts - self.probe_checkouts, 0)
+
+    @property
+    def estimated_saved_seconds(self) -> float:
+        """Оценка времени, сэкономленного запросами на отказе от pre-ping."""
+        return self.skipped_pre_pings * (self.ping_seconds or 0.0)
+
+    async def _ping_idle_connections(self) -> None:
+        pool = self.engine.sync_engine.pool
+        idle = pool.checkedin() if isinstance(pool, QueuePool) else 0
+        for _ in range(max(1, idle)):
+            started = time.perf_counter()
+            self.probe_checkouts += 1
+            async with self.engine.connect() as connection:
+                await connection.execute(text("SELECT 1"))
+            self.ping_seconds = time.perf_counter() - started
+
+    async def check(self) -> bool:
+        """Проверить доступность БД и обновить состояние автомата."""
+        if not self.breaker.allow_probe():
+            return False
+
+        self.checks += 1
+        try:
+            async with asyncio.timeout(self.timeout):
+                await self._ping_idle_connections()
+        except Exception as e:
+            if self.breaker.record_failure():
+                logger.error("БД недоступна, запросы отклоняются", shard_id=self.shard_id, error=str(e))
+                # Подключения к упавшему серверу больше не пригодны
+                await self.engine.dispose()
+            return False
+
+        if self.breaker.record_success():
+            logger.info(
+                "БД снова доступна",
+                shard_id=self.shard_id,
+                recovery_seconds=self.breaker.last_recovery_seconds,
+            )
+            # Подключения, открытые до сбоя, не проверяются при выдаче из пула
+            await self.engine.dispose()
+        return True
+
+    async def run(self) -> None:
+        """Проверять БД с заданным интервалом."""
+        while True:
+            await self.check()
+            await asyncio.sleep(self.interval)
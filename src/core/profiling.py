@@ -0,0 +1,178 @@
+import asyncio
+import cProfile
+import random
+import re
+import time
+import uuid
+from contextvars import ContextVar
+from dataclasses import dataclass, field
+from pathlib import Path
+
+import structlog
+from sqlalchemy import event
+from sqlalchemy.ext.asyncio import AsyncEngine
+
+from src.core.config import settings
+from src.core.security import is_admin_token
+
+logger = structlog.get_logger()
+
+
+@dataclass
+class RequestTimings:
+    """Время, потраченное запросом в БД и в Python."""
+
+    started: float = field(default_factory=time.perf_counter)
+    db_round_trips: int = 0
+    db_seconds: float = 0.0
+    pool_checkouts: int = 0
+    lock_wait_seconds: float = 0.0
+
+    @property
+    def total_seconds(self) -> float:
+        return time.perf_counter() - self.started
+
+    def server_timing(self) -> str:
+        """Значение заголовка Server-Timing."""
+        total = self.total_seconds
+        return ", ".join((
+            f'db;dur={self.db_seconds * 1000:.2f};desc="{self.db_round_trips} round trips"',
+            f"lock;dur={self.lock_wait_seconds * 1000:.2f}",
+            f"app;dur={max(total - self.db_seconds, 0.0) * 1000:.2f}",
+            f"total;dur={total * 1000:.2f}",
+        ))
+
+
+_current_timings: ContextVar[RequestTimings | None] = ContextVar("request_timings", default=None)
+
+
+def record_lock_wait(seconds: float) -> None:
+    """Учесть ожидание блокировки строки в текущем запросе."""
+    timings = _current_timings.get()
+    if timings is not None:
+        timings.lock_wait_seconds += seconds
+
+
+def _before_cursor_execute(conn, cursor, statement, parameters, context, executemany):
+    conn.info["query_started"] = time.perf_counter()
+
+
+def _after_cursor_execute(conn, cursor, statement, parameters, context, executemany):
+    started = conn.info.pop("query_started", None)
+    timings = _current_timings.get()
+    if timings is not None and started is not None:
+        timings.db_round_trips += 1
+        timings.db_seconds += time.perf_counter() - started
+
+
+def _checkout(dbapi_connection, connection_record, connection_proxy):
+    timings = _current_timings.get()
+    if timings is not None:
+        timings.pool_checkouts += 1
+
+
+def instrument_engine(engine: AsyncEngine) -> None:
+    """Подключить к engine учет запросов к БД в текущем HTTP-запросе."""
+    sync_engine = engine.sync_engine
+    if event.contains(sync_engine, "before_cursor_execute", _before_cursor_execute):
+        return
+
+    event.listen(sync_engine, "before_cursor_execute", _before_cursor_execute)
+    event.listen(sync_engine, "after_cursor_execute", _after_cursor_execute)
+    event.listen(sync_engine.pool, "checkout", _checkout)
+
+
+class _Profiler:
+    """Выборочное профилирование запросов через cProfile.
+
+    cProfile видит весь поток, поэтому в профиль попадают и конкурентные
+    корутины; одновременно профилируется не больше одного запроса.
+    """
+
+    def __init__(self):
+        self.active = False
+
+    def should_profile(self, headers: dict[bytes, bytes]) -> bool:
+        if self.active:
+            return False
+        token = headers.get(b"x-profile")
+        if token is not None and is_admin_token(token.decode("latin-1")):
+            return True
+        return settings.profiling_sample_rate > 0 and random.random() < settings.profiling_sample_rate
+
+    async def save(self, profile: cProfile.Profile, method: str, path: str) -> str:
+        slug = re.sub(r"[^A-Za-z0-9]+", "-", path).strip("-")[:80]
+        name = f"{time.strftime('%Y%m%dT%H%M%S')}-{method}-{slug}-{uuid.uuid4().hex[:8]}.prof"
+        directory = Path(settings.profiling_dir)
+
+        def dump() -> None:
+            directory.mkdir(parents=True, exist_ok=True)
+            profile.dump_stats(directory / name)
+
+        await asyncio.to_thread(dump)
+        return name
+
+
+_profiler = _Profiler()
+
+
+class ProfilingMiddleware:
+    """ASGI middleware: заголовок Server-Timing, структурный лог и выборочный профиль запроса."""
+
+    def __init__(self, app):
+        self.app = app
+
+    async def __call__(self, scope, receive, send):
+        if scope["type"] != "http":
+            await self.app(scope, receive, send)
+            return
+
+        timings = RequestTimings()
+        token = _current_timings.set(timings)
+        status_code = 500
+
+        profile = None
+        if _profiler.should_profile(dict(scope["headers"])):
+            _profiler.active = True
+            profile = cProfile.Profile()
+
+        async def send_with_timings(message):
+            nonlocal status_code
+            if message["type"] == "http.response.start":
+                status_code = message["status"]
+                message["headers"] = [
+                    *message.get("headers", []),
+                    (b"server-timing", timings.server_timing().encode()),
+                ]
+            await send(message)
+
+        try:
+            if profile is not None:
+                profile.enable()
+            try:
+                await self.app(scope, receive, send_with_timings)
+            finally:
+                if profile is not None:
+                    profile.disable()
+                    _profiler.active = False
+        finally:
+            _current_timings.reset(token)
+
+            profile_name = None
+            if profile is not None:
+                profile_name = await _profiler.save(profile, scope["method"], scope["path"])
+
+            total = timings.total_seconds
+            logger.info(
+                "Запрос обработан",
+                method=scope["method"],
+                path=scope["path"],
+                status_code=status_code,
+                total_ms=round(total * 1000, 2),
+                db_ms=round(timings.db_seconds * 1000, 2),
+                db_round_trips=timings.db_round_trips,
+                pool_checkouts=timings.pool_checkouts,
+                lock_wait_ms=round(timings.lock_wait_seconds * 1000, 2),
+                app_ms=round(max(total - timings.db_seconds, 0.0) * 1000, 2),
+                profile=profile_name,
+            )
@@ -0,0 +1,10 @@
+import hmac
+
+from src.core.config import settings
+
+
+def is_admin_token(token: str | None) -> bool:
+    """Проверить токен администратора."""
+    if not settings.admin_token or not token:
+        return False
+    return hmac.compare_digest(token.encode(), settings.admin_token.encode())
@@ -0,0 +1,183 @@
+import bisect
+import hashlib
+import uuid
+from collections.abc import Callable, Iterable
+
+from sqlalchemy.ext.asyncio import AsyncEngine, AsyncSession, async_sessionmaker
+from sqlalchemy.ext.horizontal_shard import ShardedSession
+from sqlalchemy.orm import Mapper, ORMExecuteState
+from sqlalchemy.sql import operators, visitors
+from sqlalchemy.sql.elements import BinaryExpression, BindParameter
+
+from src.core.exceptions import DatabaseUnavailableError
+
+# Имя шарда в режиме одной базы данных
+DEFAULT_SHARD = "default"
+
+
+def _hash(data: bytes) -> int:
+    return int.from_bytes(hashlib.blake2b(data, digest_size=8).digest(), "big")
+
+
+class HashRing:
+    """Консистентное хеш-кольцо с виртуальными узлами."""
+
+    def __init__(self, shard_ids: Iterable[str], vnodes: int = 64):
+        self.shard_ids = list(dict.fromkeys(shard_ids))
+        if not self.shard_ids:
+            raise ValueError("Хеш-кольцо должно содержать хотя бы один шард")
+
+        points = sorted(
+            (_hash(f"{shard_id}#{index}".encode()), shard_id)
+            for shard_id in self.shard_ids
+            for index in range(vnodes)
+        )
+        self._keys = [point for point, _ in points]
+        self._owners = [shard_id for _, shard_id in points]
+
+    def shard_for(self, wallet_uuid: uuid.UUID) -> str:
+        """Получить шард, которому принадлежит кошелек."""
+        index = bisect.bisect(self._keys, _hash(wallet_uuid.bytes)) % len(self._keys)
+        return self._owners[index]
+
+
+class ShardRouter:
+    """Маршрутизация кошельков по шардам.
+
+    Во время решардинга (задано предыдущее кольцо) чтения кошелька идут
+    сначала в старый шард-владелец, затем в новый: перенос сначала фиксирует
+    строку в новом шарде и только потом удаляет ее из старого под блокировкой,
+    поэтому конкурентная запись всегда находит ровно одну копию.
+    """
+
+    def __init__(
+        self,
+        shard_ids: Iterable[str],
+        previous_shard_ids: Iterable[str] | None = None,
+        vnodes: int = 64,
+        is_available: Callable[[str], bool] | None = None,
+    ):
+        self.ring = HashRing(shard_ids, vnodes)
+        self.is_available = is_available
+        self.previous_ring = HashRing(previous_shard_ids, vnodes) if previous_shard_ids else None
+
+        unknown = set(self.previous_ring.shard_ids if self.previous_ring else ()) - set(self.ring.shard_ids)
+        if unknown:
+            raise ValueError(f"Неизвестные шарды в предыдущем кольце: {sorted(unknown)}")
+
+    @property
+    def all_shards(self) -> list[str]:
+        return self.ring.shard_ids
+
+    @property
+    def default_shard(self) -> str:
+        """Шард для данных, не привязанных к кошельку."""
+        return self.ring.shard_ids[0]
+
+    @property
+    def is_migrating(self) -> bool:
+        return self.previous_ring is not None
+
+    def shard_for(self, wallet_uuid: uuid.UUID) -> str:
+        """Получить текущий шард-владелец кошелька."""
+        return self.ring.shard_for(wallet_uuid)
+
+    def shards_for(self, wallet_uuid: uuid.UUID) -> list[str]:
+        """Получить шарды, в которых может находиться кошелек."""
+        owner = self.ring.shard_for(wallet_uuid)
+        if self.previous_ring is None:
+            return [owner]
+
+        previous_owner = self.previous_ring.shard_for(wallet_uuid)
+        return [previous_owner] if previous_owner == owner else [previous_owner, owner]
+
+    def shard_chooser(self, mapper: Mapper, instance, clause=None) -> str:
+        """Выбрать шард для записи объекта или выполнения выражения."""
+        shard_key = getattr(mapper.class_, "__shard_key__", None)
+
+        if instance is not None and shard_key is not None:
+            wallet_uuid = getattr(instance, shard_key)
+            if wallet_uuid is None:
+                # Первичный ключ нужен до INSERT, чтобы выбрать шард
+                wallet_uuid = uuid.uuid4()
+                setattr(instance, shard_key, wallet_uuid)
+            return self._available(self.shard_for(wallet_uuid))
+
+        if clause is not None:
+            shards = self._shards_for_values(_routing_values(clause, [mapper]))
+            if len(shards) == 1:
+                return self._available(shards[0])
+
+        return self._available(self.default_shard)
+
+    def identity_chooser(self, mapper: Mapper, primary_key, *, lazy_loaded_from, **kw) -> list[str]:
+        """Выбрать шарды для поиска объекта по первичному ключу."""
+        if lazy_loaded_from is not None:
+            return [self._available(lazy_loaded_from.identity_token)]
+
+        shard_key = getattr(mapper.class_, "__shard_key__", None)
+        if shard_key is not None and shard_key == mapper.primary_key[0].key:
+            return [self._available(shard_id) for shard_id in self.shards_for(uuid.UUID(str(primary_key[0])))]
+
+        return [self._available(shard_id) for shard_id in self.all_shards]
+
+    def execute_chooser(self, context: ORMExecuteState) -> list[str]:
+        """Выбрать шарды для выполнения ORM-запроса."""
+        shards = self._shards_for_values(_routing_values(context.statement, context.all_mappers))
+        return [self._available(shard_id) for shard_id in shards or self.all_shards]
+
+    def _available(self, shard_id: str) -> str:
+        """Отклонить обращение к недоступному шарду, не дожидаясь таймаута пула."""
+        if self.is_available is not None and not self.is_available(shard_id):
+            raise DatabaseUnavailableError(f"Шард {shard_id} недоступен")
+        return shard_id
+
+    def _shards_for_values(self, values: Iterable[uuid.UUID]) -> list[str]:
+        shards: dict[str, None] = {}
+        for wallet_uuid in values:
+            shards.update(dict.fromkeys(self.shards_for(wallet_uuid)))
+        return list(shards)
+
+    def session_factory(self, engines: dict[str, AsyncEngine]) -> async_sessionmaker[AsyncSession]:
+        """Создать фабрику сессий, прозрачно маршрутизирующих запросы по шардам."""
+        missing = set(self.all_shards) - set(engines)
+        if missing:
+            raise ValueError(f"Нет подключений для шардов: {sorted(missing)}")
+
+        return async_sessionmaker(
+            class_=AsyncSession,
+            sync_session_class=ShardedSession,
+            expire_on_commit=False,
+            shards={shard_id: engines[shard_id].sync_engine for shard_id in self.all_shards},
+            shard_chooser=self.shard_chooser,
+            identity_chooser=self.identity_chooser,
+            execute_chooser=self.execute_chooser,
+        )
+
+
+def _routing_values(statement, mappers: Iterable[Mapper]) -> list[uuid.UUID]:
+    """Извлечь значения ключа шардирования из условий вида ``key == x`` и ``key IN (...)``."""
+    key_columns = {
+        (mapper.local_table.name, mapper.class_.__shard_key__)
+        for mapper in mappers
+        if mapper is not None and getattr(mapper.class_, "__shard_key__", None)
+    }
+    if not key_columns:
+        return []
+
+    values: list[uuid.UUID] = []
+    for element in visitors.iterate(statement):
+        if not isinstance(element, BinaryExpression) or not isinstance(element.right, BindParameter):
+            continue
+
+        table = getattr(element.left, "table", None)
+        if table is None or (table.name, getattr(element.left, "name", None)) not in key_columns:
+            continue
+
+        value = element.right.effective_value
+        if element.operator is operators.eq and value is not None:
+            values.append(uuid.UUID(str(value)))
+        elif element.operator is operators.in_op and value:
+            values.extend(uuid.UUID(str(item)) for item in value)
+
+    return values
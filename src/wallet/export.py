@@ -0,0 +1,186 @@
+import argparse
+import asyncio
+import csv
+import io
+import json
+import re
+import uuid
+import zlib
+from collections.abc import AsyncIterator, Iterable
+from contextlib import AsyncExitStack, asynccontextmanager
+from pathlib import Path
+
+import structlog
+from sqlalchemy import select, text
+from sqlalchemy.ext.asyncio import AsyncConnection, AsyncEngine
+
+from src.core.config import settings
+from src.core.database import engines
+from src.core.enums import ExportFormat
+from src.core.logging import configure_logging
+from src.wallet.models import Wallet
+
+logger = structlog.get_logger()
+
+KeyRange = tuple[uuid.UUID | None, uuid.UUID | None]
+
+_SNAPSHOT_ID = re.compile(r"^[0-9A-Fa-f-]+$")
+
+
+def uuid_ranges(parts: int) -> list[KeyRange]:
+    """Разбить пространство UUID на ``parts`` непересекающихся диапазонов [lower, upper)."""
+    bounds = [uuid.UUID(int=index * (1 << 128) // parts) for index in range(1, parts)]
+    return list(zip([None, *bounds], [*bounds, None]))
+
+
+@asynccontextmanager
+async def snapshot_connection(engine: AsyncEngine, snapshot_id: str | None = None) -> AsyncIterator[AsyncConnection]:
+    """Открыть соединение с транзакцией на согласованном снимке.
+
+    В PostgreSQL транзакция открывается в ``REPEATABLE READ``; при заданном
+    ``snapshot_id`` она использует снимок, экспортированный другой транзакцией.
+    """
+    async with engine.connect() as connection:
+        postgres = connection.dialect.name == "postgresql"
+        if postgres:
+            connection = await connection.execution_options(isolation_level="REPEATABLE READ")
+
+        async with connection.begin():
+            if postgres and snapshot_id is not None:
+                if not _SNAPSHOT_ID.match(snapshot_id):
+                    raise ValueError(f"Некорректный идентификатор снимка: {snapshot_id}")
+                await connection.execute(text(f"SET TRANSACTION SNAPSHOT '{snapshot_id}'"))
+            yield connection
+
+
+async def export_snapshot(connection: AsyncConnection) -> str | None:
+    """Экспортировать снимок текущей транзакции для параллельных читателей."""
+    if connection.dialect.name != "postgresql":
+        return None
+    return (await connection.execute(text("SELECT pg_export_snapshot()"))).scalar_one()
+
+
+async def iter_wallet_chunks(
+    connection: AsyncConnection,
+    key_range: KeyRange = (None, None),
+    chunk_size: int = 1000,
+) -> AsyncIterator[list[tuple[uuid.UUID, int]]]:
+    """Читать кошельки диапазона серверным курсором пачками в порядке UUID."""
+    lower, upper = key_range
+    query = select(Wallet.id, Wallet.balance).order_by(Wallet.id)
+    if lower is not None:
+        query = query.where(Wallet.id >= lower)
+    if upper is not None:
+        query = query.where(Wallet.id < upper)
+
+    result = await connection.stream(query.execution_options(yield_per=chunk_size))
+    async for partition in result.partitions(chunk_size):
+        yield [tuple(row) for row in partition]
+
+
+def _encode(rows: Iterable[tuple[uuid.UUID, int]], fmt: ExportFormat) -> bytes:
+    match fmt:
+        case ExportFormat.CSV:
+            buffer = io.StringIO()
+            csv.writer(buffer, lineterminator="\n").writerows((str(wallet_id), balance) for wallet_id, balance in rows)
+            return buffer.getvalue().encode()
+        case ExportFormat.NDJSON:
+            return "".join(
+                json.dumps({"wallet_uuid": str(wallet_id), "balance": balance}) + "\n"
+                for wallet_id, balance in rows
+            ).encode()
+
+
+async def stream_wallets(
+    shard_engines: dict[str, AsyncEngine],
+    fmt: ExportFormat,
+    key_range: KeyRange = (None, None),
+    compress: bool = False,
+    chunk_size: int = 1000,
+    snapshots: dict[str, str | None] | None = None,
+) -> AsyncIterator[bytes]:
+    """Выгрузить балансы кошельков диапазона со всех шардов потоком байтов.
+
+    Память не зависит от размера таблицы: в ней находится одна пачка строк
+    и буфер компрессора.
+    """
+    compressor = zlib.compressobj(wbits=31) if compress else None
+
+    def emit(data: bytes) -> bytes:
+        return compressor.compress(data) if compressor else data
+
+    if fmt is ExportFormat.CSV:
+        yield emit(b"wallet_uuid,balance\n")
+
+    for shard_id, engine in shard_engines.items():
+        snapshot_id = (snapshots or {}).get(shard_id)
+        async with snapshot_connection(engine, snapshot_id) as connection:
+            async for chunk in iter_wallet_chunks(connection, key_range, chunk_size):
+                data = emit(_encode(chunk, fmt))
+                if data:
+                    yield data
+
+    if compressor:
+        yield compressor.flush()
+
+
+async def export_to_files(
+    shard_engines: dict[str, AsyncEngine],
+    output: Path,
+    fmt: ExportFormat,
+    compress: bool = False,
+    parallel: int = 1,
+    chunk_size: int = 1000,
+) -> list[Path]:
+    """Выгрузить кошельки в файлы, по одному на диапазон UUID, параллельно.
+
+    Все диапазоны шарда читаются из одного снимка: ведущая транзакция
+    экспортирует его и держит открытым до конца выгрузки.
+    """
+    suffix = ".gz" if compress else ""
+    if parallel == 1:
+        paths = [output.with_name(output.name + suffix)]
+    else:
+        paths = [output.with_name(f"{output.name}.part-{index:03d}{suffix}") for index in range(parallel)]
+
+    async def export_part(path: Path, key_range: KeyRange, snapshots: dict[str, str | None]) -> None:
+        with path.open("wb") as file:
+            async for data in stream_wallets(shard_engines, fmt, key_range, compress, chunk_size, snapshots):
+                file.write(data)
+
+    async with AsyncExitStack() as stack:
+        snapshots = {}
+        if parallel > 1:
+            for shard_id, engine in shard_engines.items():
+                connection = await stack.enter_async_context(snapshot_connection(engine))
+                snapshots[shard_id] = await export_snapshot(connection)
+
+        await asyncio.gather(*(
+            export_part(path, key_range, snapshots)
+            for path, key_range in zip(paths, uuid_ranges(parallel))
+        ))
+
+    return paths
+
+
+async def main() -> None:
+    parser = argparse.ArgumentParser(description="Выгрузка балансов всех кошельков")
+    parser.add_argument("--output", type=Path, required=True, help="Файл выгрузки")
+    parser.add_argument("--format", type=ExportFormat, choices=list(ExportFormat), default=ExportFormat.CSV)
+    parser.add_argument("--gzip", action="store_true", help="Сжимать выгрузку gzip")
+    parser.add_argument("--parallel", type=int, default=1, help="Число параллельно выгружаемых диапазонов UUID")
+    parser.add_argument("--chunk-size", type=int, default=1000, help="Размер пачки строк")
+    args = parser.parse_args()
+
+    configure_logging(settings)
+
+    try:
+        paths = await export_to_files(engines, args.output, args.format, args.gzip, args.parallel, args.chunk_size)
+        logger.info("Выгрузка завершена", files=[str(path) for path in paths])
+    finally:
+        for engine in engines.values():
+            await engine.dispose()
+
+
+if __name__ == "__main__":
+    asyncio.run(main())
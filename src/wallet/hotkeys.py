@@ -0,0 +1,118 @@
+import time
+import uuid
+from collections.abc import Callable
+from dataclasses import dataclass, field
+
+from src.core.config import settings
+
+
+class SpaceSaving:
+    """Взвешенный счетчик heavy hitters с фиксированной памятью (Space-Saving).
+
+    Хранит не более ``capacity`` ключей. Новый ключ при заполнении вытесняет
+    ключ с минимальным счетчиком и наследует его значение, поэтому оценка
+    сверху ограничивает реальный вес ключа.
+    """
+
+    def __init__(self, capacity: int):
+        self.capacity = capacity
+        self.counts: dict[uuid.UUID, float] = {}
+
+    def add(self, key: uuid.UUID, weight: float = 1.0) -> None:
+        if key in self.counts:
+            self.counts[key] += weight
+        elif len(self.counts) < self.capacity:
+            self.counts[key] = weight
+        else:
+            evicted = min(self.counts, key=self.counts.__getitem__)
+            self.counts[key] = self.counts.pop(evicted) + weight
+
+
+@dataclass
+class _Bucket:
+    index: int
+    requests: SpaceSaving
+    lock_wait: SpaceSaving
+
+
+@dataclass
+class HotWallet:
+    wallet_uuid: uuid.UUID
+    requests: float = 0.0
+    lock_wait_seconds: float = 0.0
+
+
+@dataclass
+class HotWalletTracker:
+    """Самые нагруженные кошельки по числу запросов и времени ожидания блокировок.
+
+    Скользящее окно собирается из кольца интервалов по ``bucket_seconds``,
+    у каждого интервала свои счетчики Space-Saving.
+    """
+
+    capacity: int = 64
+    bucket_seconds: int = 10
+    bucket_count: int = 90
+    clock: Callable[[], float] = time.monotonic
+    _buckets: list[_Bucket | None] = field(init=False, repr=False)
+
+    def __post_init__(self):
+        self._buckets = [None] * self.bucket_count
+
+    @property
+    def max_window_seconds(self) -> int:
+        return self.bucket_seconds * self.bucket_count
+
+    def record_request(self, wallet_uuid: uuid.UUID) -> None:
+        """Учесть запрос к кошельку."""
+        self._current_bucket().requests.add(wallet_uuid)
+
+    def record_lock_wait(self, wallet_uuid: uuid.UUID, seconds: float) -> None:
+        """Учесть время ожидания блокировки строки кошелька."""
+        self._current_bucket().lock_wait.add(wallet_uuid, seconds)
+
+    def top(self, limit: int, window_seconds: int) -> tuple[list[HotWallet], list[HotWallet]]:
+        """Получить топ кошельков по запросам и по ожиданию блокировок за окно."""
+        current = self._index()
+        oldest = current - min(window_seconds, self.max_window_seconds) // self.bucket_seconds + 1
+
+        merged: dict[uuid.UUID, HotWallet] = {}
+        for bucket in self._buckets:
+            if bucket is None or not oldest <= bucket.index <= current:
+                continue
+            for wallet_uuid, count in bucket.requests.counts.items():
+                merged.setdefault(wallet_uuid, HotWallet(wallet_uuid)).requests += count
+            for wallet_uuid, seconds in bucket.lock_wait.counts.items():
+                merged.setdefault(wallet_uuid, HotWallet(wallet_uuid)).lock_wait_seconds += seconds
+
+        by_requests = sorted(
+            (item for item in merged.values() if item.requests),
+            key=lambda item: item.requests,
+            reverse=True,
+        )
+        by_lock_wait = sorted(
+            (item for item in merged.values() if item.lock_wait_seconds),
+            key=lambda item: item.lock_wait_seconds,
+            reverse=True,
+        )
+        return by_requests[:limit], by_lock_wait[:limit]
+
+    def _index(self) -> int:
+        return int(self.clock() // self.bucket_seconds)
+
+    def _current_bucket(self) -> _Bucket:
+        index = self._index()
+        slot = index % self.bucket_count
+        bucket = self._buckets[slot]
+        if bucket is None or bucket.index != index:
+            bucket = _Bucket(index, SpaceSaving(self.capacity), SpaceSaving(self.capacity))
+            self._buckets[slot] = bucket
+        return bucket
+
+
+# Глобальный трекер горячих кошельков
+hot_wallets = HotWalletTracker(
+    capacity=settings.hot_wallets_capacity,
+    bucket_seconds=settings.hot_wallets_bucket_seconds,
+    bucket_count=settings.hot_wallets_buckets,
+)
@@ -0,0 +1,227 @@
+import asyncio
+import uuid
+from collections.abc import AsyncIterator
+from dataclasses import dataclass
+
+import structlog
+from pydantic import ValidationError
+from sqlalchemy import select
+from sqlalchemy.ext.asyncio import AsyncSession, async_sessionmaker
+
+from src.core.enums import ErrorMessages, IngestLineStatus
+from src.core.exceptions import (
+    IngestConflictError,
+    InsufficientFundsError,
+    InvalidCheckpointError,
+    WalletNotFoundError,
+)
+from src.wallet.models import IngestCheckpoint
+from src.wallet.schemas import IngestCheckpointLine, IngestLineResult, WalletOperationLine
+from src.wallet.services import WalletService
+
+logger = structlog.get_logger()
+
+
+@dataclass
+class _Chunk:
+    # Номер строки и операция либо текст ошибки разбора
+    lines: list[tuple[int, WalletOperationLine | str]]
+    last_line: int
+
+
+def parse_checkpoint(token: str) -> uuid.UUID:
+    """Получить идентификатор загрузки из токена продолжения."""
+    try:
+        return uuid.UUID(token.split(":", 1)[0])
+    except ValueError:
+        raise InvalidCheckpointError(token)
+
+
+def _checkpoint_token(upload_id: uuid.UUID, lines_committed: int) -> str:
+    return f"{upload_id}:{lines_committed}"
+
+
+def _encode(line: IngestLineResult | IngestCheckpointLine) -> bytes:
+    return line.model_dump_json(exclude_none=True).encode() + b"\n"
+
+
+async def split_lines(body: AsyncIterator[bytes], max_line_bytes: int) -> AsyncIterator[bytes | None]:
+    """Разбить поток байтов на строки, не накапливая больше одной строки.
+
+    Вместо строки длиннее ``max_line_bytes`` возвращается ``None``.
+    """
+    buffer = bytearray()
+    oversized = False
+
+    async for data in body:
+        start = 0
+        while (end := data.find(b"\n", start)) != -1:
+            if oversized or len(buffer) + end - start > max_line_bytes:
+                yield None
+            else:
+                buffer += data[start:end]
+                yield bytes(buffer)
+            buffer.clear()
+            oversized = False
+            start = end + 1
+
+        if not oversized:
+            buffer += data[start:]
+            if len(buffer) > max_line_bytes:
+                buffer.clear()
+                oversized = True
+
+    if oversized:
+        yield None
+    elif buffer:
+        yield bytes(buffer)
+
+
+async def _read_chunks(
+    body: AsyncIterator[bytes],
+    skip_lines: int,
+    chunk_size: int,
+    max_line_bytes: int,
+    queue: asyncio.Queue[_Chunk | None],
+) -> None:
+    """Разбирать входной поток в пачки, пока предыдущие пачки применяются к БД."""
+    lines: list[tuple[int, WalletOperationLine | str]] = []
+    line_number = 0
+    queued_line = skip_lines
+
+    try:
+        async for raw in split_lines(body, max_line_bytes):
+            line_number += 1
+            if line_number <= skip_lines:
+                continue
+
+            if raw is None:
+                lines.append((line_number, ErrorMessages.LINE_TOO_LONG))
+            elif raw.strip():
+                try:
+                    lines.append((line_number, WalletOperationLine.model_validate_json(raw)))
+                except ValidationError:
+                    lines.append((line_number, ErrorMessages.INVALID_REQUEST_DATA))
+
+            if len(lines) >= chunk_size:
+                await queue.put(_Chunk(lines, line_number))
+                lines, queued_line = [], line_number
+
+        if line_number > queued_line:
+            await queue.put(_Chunk(lines, line_number))
+    except asyncio.CancelledError:
+        raise
+    except Exception:
+        # Обработчик пачек еще работает: даем ему завершиться
+        await queue.put(None)
+        raise
+
+    await queue.put(None)
+
+
+async def _apply_chunk(
+    session_factory: async_sessionmaker[AsyncSession],
+    upload_id: uuid.UUID,
+    lines_committed: int,
+    chunk: _Chunk,
+) -> list[IngestLineResult]:
+    """Применить пачку и сдвинуть контрольную точку в одной транзакции."""
+    operations = [(number, item) for number, item in chunk.lines if isinstance(item, WalletOperationLine)]
+
+    async with session_factory() as session:
+        checkpoint = (await session.execute(
+            select(IngestCheckpoint).where(IngestCheckpoint.upload_id == upload_id).with_for_update()
+        )).scalar_one()
+        if checkpoint.lines_committed != lines_committed:
+            raise IngestConflictError(f"Загрузка {upload_id} продолжена параллельно")
+        checkpoint.lines_committed = chunk.last_line
+
+        outcomes = await WalletService(session).apply_batch(
+            [(item.wallet_uuid, item.operation_type, item.amount) for _, item in operations]
+        )
+
+    by_line = dict(zip((number for number, _ in operations), outcomes))
+    results = []
+    for number, item in chunk.lines:
+        if isinstance(item, str):
+            results.append(IngestLineResult(line=number, status=IngestLineStatus.ERROR, detail=item))
+            continue
+
+        outcome = by_line[number]
+        match outcome:
+            case WalletNotFoundError():
+                detail = ErrorMessages.WALLET_NOT_FOUND
+            case InsufficientFundsError():
+                detail = ErrorMessages.INSUFFICIENT_FUNDS
+            case _:
+                results.append(IngestLineResult(
+                    line=number, status=IngestLineStatus.OK, wallet_uuid=item.wallet_uuid, balance=outcome
+                ))
+                continue
+        results.append(IngestLineResult(
+            line=number, status=IngestLineStatus.ERROR, wallet_uuid=item.wallet_uuid, detail=detail
+        ))
+
+    return results
+
+
+async def ingest_operations(
+    session_factory: async_sessionmaker[AsyncSession],
+    body: AsyncIterator[bytes],
+    upload_id: uuid.UUID,
+    chunk_size: int,
+    max_line_bytes: int,
+) -> AsyncIterator[bytes]:
+    """Применить операции из NDJSON-потока и вернуть поток результатов по строкам.
+
+    Строки применяются пачками по ``chunk_size`` в отдельных транзакциях;
+    следующая пачка разбирается, пока предыдущая фиксируется. После каждой
+    пачки выдается токен: при повторной отправке того же тела с ним уже
+    зафиксированные строки пропускаются. При шардировании пачка фиксируется
+    на шардах по очереди, и контрольная точка атомарна только с ее шардом.
+    """
+    async with session_factory() as session:
+        checkpoint = await session.get(IngestCheckpoint, upload_id)
+        if checkpoint is None:
+            checkpoint = IngestCheckpoint(upload_id=upload_id, lines_committed=0)
+            session.add(checkpoint)
+            await session.commit()
+        lines_committed = checkpoint.lines_committed
+
+    logger.info("Загрузка операций", upload_id=str(upload_id), lines_committed=lines_committed)
+    yield _encode(IngestCheckpointLine(
+        checkpoint=_checkpoint_token(upload_id, lines_committed), lines_committed=lines_committed
+    ))
+
+    # Очередь из двух пачек ограничивает память и позволяет разбирать вход параллельно с БД
+    queue: asyncio.Queue[_Chunk | None] = asyncio.Queue(maxsize=2)
+    reader = asyncio.create_task(_read_chunks(body, lines_committed, chunk_size, max_line_bytes, queue))
+    try:
+        while (chunk := await queue.get()) is not None:
+            try:
+                results = await _apply_chunk(session_factory, upload_id, lines_committed, chunk)
+            except Exception as e:
+                logger.error("Ошибка загрузки операций", upload_id=str(upload_id), error=str(e), exc_info=True)
+                detail = (
+                    ErrorMessages.INVALID_CHECKPOINT if isinstance(e, IngestConflictError)
+                    else ErrorMessages.INTERNAL_SERVER_ERROR
+                )
+                yield _encode(IngestCheckpointLine(
+                    checkpoint=_checkpoint_token(upload_id, lines_committed),
+                    lines_committed=lines_committed,
+                    detail=detail,
+                ))
+                return
+
+            lines_committed = chunk.last_line
+            for result in results:
+                yield _encode(result)
+            yield _encode(IngestCheckpointLine(
+                checkpoint=_checkpoint_token(upload_id, lines_committed), lines_committed=lines_committed
+            ))
+
+        await reader
+    finally:
+        reader.cancel()
+
+    logger.info("Загрузка операций завершена", upload_id=str(upload_id), lines_committed=lines_committed)
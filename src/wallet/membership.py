@@ -0,0 +1,172 @@
+import asyncio
+import hashlib
+import math
+import time
+import uuid
+from dataclasses import dataclass
+
+import structlog
+from sqlalchemy import event, func, select
+from sqlalchemy.ext.asyncio import AsyncEngine
+
+from src.core.config import settings
+from src.wallet.export import iter_wallet_chunks, snapshot_connection
+from src.wallet.models import Wallet
+
+logger = structlog.get_logger()
+
+
+class BloomFilter:
+    """Фильтр Блума по UUID кошельков.
+
+    Отрицательный ответ точен, положительный ложен с вероятностью не выше
+    ``error_rate`` при числе элементов до ``capacity``.
+    """
+
+    def __init__(self, capacity: int, error_rate: float):
+        self.capacity = max(capacity, 1)
+        self.bit_count = max(8, math.ceil(-self.capacity * math.log(error_rate) / math.log(2) ** 2))
+        self.hash_count = max(1, round(self.bit_count / self.capacity * math.log(2)))
+        self.bits = bytearray((self.bit_count + 7) // 8)
+        self.items = 0
+
+    def _positions(self, wallet_uuid: uuid.UUID) -> list[int]:
+        digest = hashlib.blake2b(wallet_uuid.bytes, digest_size=16).digest()
+        first = int.from_bytes(digest[:8], "little")
+        second = int.from_bytes(digest[8:], "little") | 1
+        return [(first + index * second) % self.bit_count for index in range(self.hash_count)]
+
+    def add(self, wallet_uuid: uuid.UUID) -> None:
+        for position in self._positions(wallet_uuid):
+            self.bits[position >> 3] |= 1 << (position & 7)
+        self.items += 1
+
+    def __contains__(self, wallet_uuid: uuid.UUID) -> bool:
+        return all(self.bits[position >> 3] & (1 << (position & 7)) for position in self._positions(wallet_uuid))
+
+    @property
+    def memory_bytes(self) -> int:
+        return len(self.bits)
+
+    @property
+    def false_positive_rate(self) -> float:
+        """Оценка доли ложноположительных ответов при текущем заполнении."""
+        return (1 - math.exp(-self.hash_count * self.items / self.bit_count)) ** self.hash_count
+
+
+@dataclass
+class MembershipStats:
+    ready: bool
+    items: int = 0
+    capacity: int = 0
+    memory_bytes: int = 0
+    hash_count: int = 0
+    false_positive_rate: float = 0.0
+    rebuild_seconds: float = 0.0
+    rejected: int = 0
+
+
+class WalletMembership:
+    """Фильтр существующих кошельков, отсекающий запросы к несуществующим без БД.
+
+    Пока фильтр не построен, считается, что любой кошелек может существовать.
+    Кошельки, созданные через ORM в этом процессе, добавляются сразу; созданные
+    в обход процесса попадают в фильтр при следующей периодической пересборке.
+    """
+
+    def __init__(self, error_rate: float, growth: float = 2.0, min_capacity: int = 1024):
+        self.error_rate = error_rate
+        self.growth = growth
+        self.min_capacity = min_capacity
+        self.rebuild_seconds = 0.0
+        self.rejected = 0
+        self._filter: BloomFilter | None = None
+        self._pending: list[uuid.UUID] | None = None
+
+    @property
+    def ready(self) -> bool:
+        return self._filter is not None
+
+    def might_exist(self, wallet_uuid: uuid.UUID) -> bool:
+        """Проверить, может ли кошелек существовать."""
+        if self._filter is None or wallet_uuid in self._filter:
+            return True
+        self.rejected += 1
+        return False
+
+    def add(self, wallet_uuid: uuid.UUID) -> None:
+        """Добавить созданный кошелек."""
+        if self._filter is not None:
+            self._filter.add(wallet_uuid)
+        if self._pending is not None:
+            self._pending.append(wallet_uuid)
+
+    def clear(self) -> None:
+        """Сбросить фильтр: до следующей сборки все кошельки считаются возможными."""
+        self._filter = None
+
+    async def rebuild(self, shard_engines: dict[str, AsyncEngine], chunk_size: int = 10000) -> None:
+        """Построить фильтр заново потоковым сканированием всех шардов."""
+        started = time.perf_counter()
+        self._pending = []
+        try:
+            total = 0
+            for engine in shard_engines.values():
+                async with engine.connect() as connection:
+                    total += (await connection.execute(select(func.count()).select_from(Wallet))).scalar_one()
+
+            bloom = BloomFilter(max(int(total * self.growth), self.min_capacity), self.error_rate)
+            for engine in shard_engines.values():
+                async with snapshot_connection(engine) as connection:
+                    async for chunk in iter_wallet_chunks(connection, chunk_size=chunk_size):
+                        for wallet_id, _ in chunk:
+                            bloom.add(wallet_id)
+
+            # Кошельки, созданные во время сканирования
+            for wallet_uuid in self._pending:
+                bloom.add(wallet_uuid)
+            self._filter = bloom
+        finally:
+            self._pending = None
+
+        self.rebuild_seconds = time.perf_counter() - started
+        logger.info(
+            "Фильтр кошельков построен",
+            items=bloom.items,
+            memory_bytes=bloom.memory_bytes,
+            false_positive_rate=bloom.false_positive_rate,
+            rebuild_seconds=self.rebuild_seconds,
+        )
+
+    async def run(self, shard_engines: dict[str, AsyncEngine], interval: float) -> None:
+        """Собирать фильтр при старте и пересобирать его периодически."""
+        while True:
+            try:
+                await self.rebuild(shard_engines)
+            except Exception as e:
+                logger.error("Ошибка построения фильтра кошельков", error=str(e), exc_info=True)
+            await asyncio.sleep(interval)
+
+    def stats(self) -> MembershipStats:
+        if self._filter is None:
+            return MembershipStats(ready=False, rejected=self.rejected)
+        return MembershipStats(
+            ready=True,
+            items=self._filter.items,
+            capacity=self._filter.capacity,
+            memory_bytes=self._filter.memory_bytes,
+            hash_count=self._filter.hash_count,
+            false_positive_rate=self._filter.false_positive_rate,
+            rebuild_seconds=self.rebuild_seconds,
+            rejected=self.rejected,
+        )
+
+
+# Глобальный фильтр существующих кошельков
+wallet_membership = WalletMembership(error_rate=settings.membership_filter_error_rate)
+
+
+@event.listens_for(Wallet, "after_insert")
+def _add_created_wallet(mapper, connection, target: Wallet) -> None:
+    # Лишний элемент при откате транзакции дает лишь ложноположительный ответ
+    wallet_membership.add(target.id)
@@ -1,6 +1,6 @@
 import uuid
 
-from sqlalchemy import Column, Integer, CheckConstraint
+from sqlalchemy import BigInteger, Column, DateTime, Integer, CheckConstraint, func
 from sqlalchemy.dialects.postgresql import UUID
 from sqlalchemy.orm import declarative_base
 
@@ -9,6 +9,8 @@ Base = declarative_base()
 
 class Wallet(Base):
     __tablename__ = "wallets"
+    # Атрибут, по которому кошелек распределяется по шардам
+    __shard_key__ = "id"
     
     id = Column(UUID(as_uuid=True), primary_key=True, default=uuid.uuid4)
     balance = Column(Integer, nullable=False, default=0)
@@ -16,3 +18,13 @@ class Wallet(Base):
     __table_args__ = (
         CheckConstraint('balance >= 0', name='check_balance_non_negative'),
     )
+
+
+class IngestCheckpoint(Base):
+    """Прогресс потоковой загрузки операций: число зафиксированных строк."""
+
+    __tablename__ = "ingest_checkpoints"
+
+    upload_id = Column(UUID(as_uuid=True), primary_key=True)
+    lines_committed = Column(BigInteger, nullable=False, default=0)
+    updated_at = Column(DateTime(timezone=True), nullable=False, server_default=func.now(), onupdate=func.now())
@@ -0,0 +1,136 @@
+import argparse
+import asyncio
+import uuid
+from collections import Counter, defaultdict
+
+import structlog
+from sqlalchemy import Table, delete, insert, select
+from sqlalchemy.ext.asyncio import AsyncEngine
+
+from src.core.config import settings
+from src.core.database import engines, shard_router
+from src.core.logging import configure_logging
+from src.core.sharding import ShardRouter
+from src.wallet.models import Base, Wallet
+
+logger = structlog.get_logger()
+
+
+def _dependent_tables() -> list[Table]:
+    """Таблицы со строками, которые живут на шарде своего кошелька."""
+    return [table for table in Base.metadata.sorted_tables if "wallet_id" in table.c]
+
+
+async def move_wallets(
+    source_engine: AsyncEngine,
+    target_engine: AsyncEngine,
+    wallet_ids: list[uuid.UUID],
+) -> int:
+    """Перенести кошельки вместе со связанными строками с одного шарда на другой.
+
+    Строки блокируются в исходном шарде на все время переноса. Копия фиксируется
+    в целевом шарде до удаления оригинала, поэтому запись, ожидающая блокировку,
+    после ее снятия найдет кошелек в целевом шарде. Повторный запуск после сбоя
+    перезаписывает неполную копию: пока оригинал не удален, он считается главным.
+    """
+    wallets = Wallet.__table__
+    dependent_tables = _dependent_tables()
+
+    async with source_engine.begin() as source:
+        result = await source.execute(
+            select(wallets).where(wallets.c.id.in_(wallet_ids)).with_for_update()
+        )
+        wallet_rows = [dict(row) for row in result.mappings()]
+        if not wallet_rows:
+            return 0
+
+        wallet_ids = [row["id"] for row in wallet_rows]
+        dependent_rows = {}
+        for table in dependent_tables:
+            result = await source.execute(
+                select(table).where(table.c.wallet_id.in_(wallet_ids)).with_for_update()
+            )
+            dependent_rows[table] = [dict(row) for row in result.mappings()]
+
+        async with target_engine.begin() as target:
+            for table in reversed(dependent_tables):
+                await target.execute(delete(table).where(table.c.wallet_id.in_(wallet_ids)))
+            await target.execute(delete(wallets).where(wallets.c.id.in_(wallet_ids)))
+
+            await target.execute(insert(wallets), wallet_rows)
+            for table in dependent_tables:
+                if dependent_rows[table]:
+                    await target.execute(insert(table), dependent_rows[table])
+
+        for table in reversed(dependent_tables):
+            await source.execute(delete(table).where(table.c.wallet_id.in_(wallet_ids)))
+        await source.execute(delete(wallets).where(wallets.c.id.in_(wallet_ids)))
+
+    return len(wallet_rows)
+
+
+async def reshard(
+    shard_engines: dict[str, AsyncEngine],
+    router: ShardRouter,
+    batch_size: int = 500,
+) -> Counter[str]:
+    """Перенести все кошельки, лежащие не на своем шарде, к текущим владельцам."""
+    wallets = Wallet.__table__
+    moved: Counter[str] = Counter()
+
+    for source_shard in router.all_shards:
+        last_id = None
+
+        while True:
+            query = select(wallets.c.id).order_by(wallets.c.id).limit(batch_size)
+            if last_id is not None:
+                query = query.where(wallets.c.id > last_id)
+
+            async with shard_engines[source_shard].connect() as connection:
+                wallet_ids = (await connection.execute(query)).scalars().all()
+
+            if not wallet_ids:
+                break
+            last_id = wallet_ids[-1]
+
+            by_target: dict[str, list[uuid.UUID]] = defaultdict(list)
+            for wallet_id in wallet_ids:
+                target_shard = router.shard_for(wallet_id)
+                if target_shard != source_shard:
+                    by_target[target_shard].append(wallet_id)
+
+            for target_shard, batch in by_target.items():
+                count = await move_wallets(
+                    shard_engines[source_shard], shard_engines[target_shard], batch
+                )
+                moved[f"{source_shard}->{target_shard}"] += count
+                logger.info(
+                    "Кошельки перенесены",
+                    source_shard=source_shard,
+                    target_shard=target_shard,
+                    count=count,
+                )
+
+    return moved
+
+
+async def main() -> None:
+    parser = argparse.ArgumentParser(description="Перенос кошельков между шардами")
+    parser.add_argument("--batch-size", type=int, default=500, help="Размер пачки кошельков")
+    args = parser.parse_args()
+
+    configure_logging(settings)
+
+    if shard_router is None:
+        raise SystemExit("Шардирование не настроено: задайте DB_SHARDS")
+
+    try:
+        moved = await reshard(engines, shard_router, args.batch_size)
+        logger.info("Решардинг завершен", moved=dict(moved), total=sum(moved.values()))
+    finally:
+        for shard_engine in engines.values():
+            await shard_engine.dispose()
+
+
+if __name__ == "__main__":
+    asyncio.run(main())
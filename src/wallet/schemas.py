@@ -2,7 +2,7 @@ import uuid
 
 from pydantic import BaseModel, Field, ConfigDict
 
-from src.core.enums import OperationType
+from src.core.enums import CircuitState, IngestLineStatus, OperationType
 
 
 class WalletOperationRequest(BaseModel):
@@ -10,8 +10,63 @@ class WalletOperationRequest(BaseModel):
     amount: int = Field(ge=1, description="Сумма операции")
 
 
+class WalletOperationLine(WalletOperationRequest):
+    wallet_uuid: uuid.UUID = Field(description="UUID кошелька")
+
+
+class IngestLineResult(BaseModel):
+    line: int = Field(description="Номер строки во входном потоке")
+    status: IngestLineStatus
+    wallet_uuid: uuid.UUID | None = None
+    balance: int | None = Field(default=None, description="Баланс после операции")
+    detail: str | None = None
+
+
+class IngestCheckpointLine(BaseModel):
+    checkpoint: str = Field(description="Токен для продолжения загрузки")
+    lines_committed: int = Field(description="Число зафиксированных строк")
+    detail: str | None = Field(default=None, description="Причина остановки загрузки")
+
+
 class WalletResponse(BaseModel):
     model_config = ConfigDict(from_attributes=True)
     
     wallet_uuid: uuid.UUID
     balance: int = Field(description="Текущий баланс")
+
+
+class HotWalletEntry(BaseModel):
+    wallet_uuid: uuid.UUID
+    requests: int = Field(description="Число запросов за окно (оценка сверху)")
+    requests_per_second: float = Field(description="Средняя частота запросов за окно")
+    lock_wait_seconds: float = Field(description="Суммарное ожидание блокировки за окно")
+
+
+class HotWalletsResponse(BaseModel):
+    window_seconds: int
+    by_requests: list[HotWalletEntry]
+    by_lock_wait: list[HotWalletEntry]
+
+
+class MembershipFilterResponse(BaseModel):
+    model_config = ConfigDict(from_attributes=True)
+
+    ready: bool = Field(description="Фильтр построен и используется")
+    items: int = Field(description="Число кошельков в фильтре")
+    capacity: int = Field(description="Расчетная емкость фильтра")
+    memory_bytes: int = Field(description="Размер битового массива")
+    hash_count: int = Field(description="Число хеш-функций")
+    false_positive_rate: float = Field(description="Оценка доли ложноположительных ответов")
+    rebuild_seconds: float = Field(description="Длительность последней сборки")
+    rejected: int = Field(description="Запросов отклонено без обращения к БД")
+
+
+class DatabaseHealthEntry(BaseModel):
+    shard_id: str
+    state: CircuitState = Field(description="Состояние автомата доступности")
+    failures: int = Field(description="Неудачных проверок подряд")
+    checks: int = Field(description="Выполнено проверок")
+    ping_ms: float | None = Field(description="Задержка последнего пинга")
+    skipped_pre_pings: int = Field(description="Выдач подключений без pre-ping")
+    estimated_saved_ms: float = Field(description="Оценка сэкономленного на pre-ping времени")
+    last_recovery_seconds: float | None = Field(description="Длительность последнего сбоя до восстановления")
@@ -1,10 +1,17 @@
+import time
 import uuid
+from collections import defaultdict
+from collections.abc import Sequence
 
 import structlog
 from sqlalchemy import select
 from sqlalchemy.ext.asyncio import AsyncSession
 
+from src.core.enums import OperationType
 from src.core.exceptions import WalletNotFoundError, InsufficientFundsError
+from src.core.profiling import record_lock_wait
+from src.wallet.hotkeys import hot_wallets
+from src.wallet.membership import wallet_membership
 from src.wallet.models import Wallet
 
 logger = structlog.get_logger()
@@ -17,6 +24,7 @@ class WalletService:
     async def get_wallet(self, wallet_uuid: uuid.UUID) -> Wallet:
         """Получить кошелек по UUID."""
         logger.info("Получение кошелька", wallet_uuid=str(wallet_uuid))
+        self._ensure_may_exist(wallet_uuid)
         
         result = await self.db_session.execute(
             select(Wallet).where(Wallet.id == wallet_uuid)
@@ -34,10 +42,7 @@ class WalletService:
         """Пополнить кошелек."""
         logger.info("Пополнение кошелька", wallet_uuid=str(wallet_uuid), amount=amount)
         
-        wallet = await self._get_wallet_with_lock(wallet_uuid)
-        old_balance = wallet.balance
-        
-        wallet.balance += amount
+        wallet, old_balance = await self._apply_operation(wallet_uuid, OperationType.DEPOSIT, amount)
         
         await self.db_session.commit()
         await self.db_session.refresh(wallet)
@@ -56,19 +61,7 @@ class WalletService:
         """Снять с кошелька."""
         logger.info("Снятие с кошелька", wallet_uuid=str(wallet_uuid), amount=amount)
         
-        wallet = await self._get_wallet_with_lock(wallet_uuid)
-        old_balance = wallet.balance
-        
-        if wallet.balance < amount:
-            logger.error(
-                "Недостаточно средств",
-                wallet_uuid=str(wallet_uuid),
-                requested_amount=amount,
-                current_balance=wallet.balance
-            )
-            raise InsufficientFundsError()
-        
-        wallet.balance -= amount
+        wallet, old_balance = await self._apply_operation(wallet_uuid, OperationType.WITHDRAW, amount)
         
         await self.db_session.commit()
         await self.db_session.refresh(wallet)
@@ -83,11 +76,77 @@ class WalletService:
         
         return wallet
     
+    async def apply_batch(
+        self,
+        operations: Sequence[tuple[uuid.UUID, OperationType, int]],
+    ) -> list[int | WalletNotFoundError | InsufficientFundsError]:
+        """Выполнить пачку операций в одной транзакции.
+
+        Для каждой операции возвращается баланс после нее либо ошибка; ошибка
+        операции не отменяет остальные. Операции одного кошелька выполняются в
+        исходном порядке, а кошельки блокируются по возрастанию UUID, чтобы
+        конкурентные пачки не взаимоблокировались.
+        """
+        by_wallet: dict[uuid.UUID, list[int]] = defaultdict(list)
+        for index, (wallet_uuid, _, _) in enumerate(operations):
+            by_wallet[wallet_uuid].append(index)
+
+        results: list[int | WalletNotFoundError | InsufficientFundsError] = [0] * len(operations)
+        for wallet_uuid in sorted(by_wallet):
+            for index in by_wallet[wallet_uuid]:
+                _, operation_type, amount = operations[index]
+                try:
+                    wallet, _ = await self._apply_operation(wallet_uuid, operation_type, amount)
+                    results[index] = wallet.balance
+                except (WalletNotFoundError, InsufficientFundsError) as e:
+                    results[index] = e
+
+        await self.db_session.commit()
+        logger.info("Пачка операций выполнена", operations=len(operations), wallets=len(by_wallet))
+
+        return results
+
+    async def _apply_operation(
+        self,
+        wallet_uuid: uuid.UUID,
+        operation_type: OperationType,
+        amount: int,
+    ) -> tuple[Wallet, int]:
+        """Изменить баланс под блокировкой без фиксации транзакции.
+
+        Проверки выполняются до изменения, поэтому при ошибке состояние
+        сессии не меняется. Возвращает кошелек и баланс до операции.
+        """
+        wallet = await self._get_wallet_with_lock(wallet_uuid)
+        old_balance = wallet.balance
+
+        match operation_type:
+            case OperationType.DEPOSIT:
+                wallet.balance += amount
+            case OperationType.WITHDRAW:
+                if wallet.balance < amount:
+                    logger.error(
+                        "Недостаточно средств",
+                        wallet_uuid=str(wallet_uuid),
+                        requested_amount=amount,
+                        current_balance=wallet.balance
+                    )
+                    raise InsufficientFundsError()
+                wallet.balance -= amount
+
+        return wallet, old_balance
+
     async def _get_wallet_with_lock(self, wallet_uuid: uuid.UUID) -> Wallet:
         """Получить кошелек с блокировкой."""
+        self._ensure_may_exist(wallet_uuid)
+
+        started = time.perf_counter()
         result = await self.db_session.execute(
             select(Wallet).where(Wallet.id == wallet_uuid).with_for_update()
         )
+        lock_wait = time.perf_counter() - started
+        hot_wallets.record_lock_wait(wallet_uuid, lock_wait)
+        record_lock_wait(lock_wait)
         wallet = result.scalar_one_or_none()
         
         if not wallet:
@@ -95,3 +154,10 @@ class WalletService:
             raise WalletNotFoundError(f"Кошелек {wallet_uuid} не найден")
         
         return wallet
+
+    @staticmethod
+    def _ensure_may_exist(wallet_uuid: uuid.UUID) -> None:
+        """Отсечь заведомо несуществующий кошелек без обращения к БД."""
+        if not wallet_membership.might_exist(wallet_uuid):
+            logger.warning("Кошелек отсутствует в фильтре", wallet_uuid=str(wallet_uuid))
+            raise WalletNotFoundError(f"Кошелек {wallet_uuid} не найден")
@@ -14,7 +14,7 @@ from sqlalchemy.pool import NullPool, StaticPool
 sys.path.insert(0, str(Path(__file__).parent.parent))
 
 from src.app import app
-from src.core.database import get_db_session
+from src.core.database import get_db_engines, get_db_session, get_session_factory
 from src.wallet.models import Base, Wallet
 
 
@@ -104,7 +104,12 @@ async def client(db_session: AsyncSession) -> AsyncGenerator[AsyncClient, None]:
         async with SESSION_FACTORY() as session:
             yield session
 
+    async def override_get_db_engines() -> dict[str, AsyncEngine]:
+        return {"default": TEST_ENGINE}
+
     app.dependency_overrides[get_db_session] = override_get_db_session
+    app.dependency_overrides[get_db_engines] = override_get_db_engines
+    app.dependency_overrides[get_session_factory] = lambda: SESSION_FACTORY
 
     async with AsyncClient(transport=ASGITransport(app=app), base_url="http://test") as http_client:
         yield http_client
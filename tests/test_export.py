@@ -0,0 +1,119 @@
+import gzip
+import json
+import uuid
+
+import pytest
+from httpx import AsyncClient
+from sqlalchemy.ext.asyncio import AsyncSession, create_async_engine
+
+from src.core.config import settings
+from src.core.enums import ExportFormat
+from src.wallet.export import export_to_files, uuid_ranges
+from src.wallet.models import Base, Wallet
+
+ADMIN_HEADERS = {"X-Admin-Token": "secret"}
+
+
+class TestUuidRanges:
+    """Тесты разбиения пространства UUID."""
+
+    def test_ranges_cover_keyspace(self):
+        ranges = uuid_ranges(4)
+
+        assert len(ranges) == 4
+        assert ranges[0][0] is None and ranges[-1][1] is None
+        for (_, upper), (lower, _) in zip(ranges, ranges[1:]):
+            assert upper == lower
+
+    def test_every_uuid_falls_into_one_range(self):
+        ranges = uuid_ranges(7)
+        for _ in range(200):
+            wallet_id = uuid.uuid4()
+            matches = [
+                (lower, upper) for lower, upper in ranges
+                if (lower is None or wallet_id >= lower) and (upper is None or wallet_id < upper)
+            ]
+            assert len(matches) == 1
+
+
+class TestExportEndpoint:
+    """Тесты потоковой выгрузки балансов."""
+
+    @pytest.mark.asyncio
+    async def test_export_csv(self, client: AsyncClient, db_session: AsyncSession, monkeypatch):
+        monkeypatch.setattr(settings, "admin_token", "secret")
+        wallets = [Wallet(balance=index * 10) for index in range(5)]
+        db_session.add_all(wallets)
+        await db_session.commit()
+
+        response = await client.get("/api/v1/admin/wallets/export", headers=ADMIN_HEADERS)
+
+        assert response.status_code == 200
+        assert response.headers["content-type"].startswith("text/csv")
+        lines = response.text.splitlines()
+        assert lines[0] == "wallet_uuid,balance"
+        assert lines[1:] == [f"{w.id},{w.balance}" for w in sorted(wallets, key=lambda w: w.id)]
+
+    @pytest.mark.asyncio
+    async def test_export_ndjson_gzip_parts(self, client: AsyncClient, db_session: AsyncSession, monkeypatch):
+        monkeypatch.setattr(settings, "admin_token", "secret")
+        wallets = [Wallet(balance=index) for index in range(20)]
+        db_session.add_all(wallets)
+        await db_session.commit()
+
+        exported = {}
+        for part in range(3):
+            response = await client.get(
+                "/api/v1/admin/wallets/export",
+                params={"format": ExportFormat.NDJSON, "gzip": True, "part": part, "parts": 3},
+                headers=ADMIN_HEADERS,
+            )
+            assert response.status_code == 200
+            for line in gzip.decompress(response.content).decode().splitlines():
+                item = json.loads(line)
+                exported[item["wallet_uuid"]] = item["balance"]
+
+        assert exported == {str(w.id): w.balance for w in wallets}
+
+    @pytest.mark.asyncio
+    async def test_invalid_part(self, client: AsyncClient, monkeypatch):
+        monkeypatch.setattr(settings, "admin_token", "secret")
+
+        response = await client.get(
+            "/api/v1/admin/wallets/export",
+            params={"part": 2, "parts": 2},
+            headers=ADMIN_HEADERS,
+        )
+
+        assert response.status_code == 400
+
+
+class TestExportToFiles:
+    """Тесты CLI-выгрузки в файлы."""
+
+    @pytest.mark.asyncio
+    async def test_parallel_export(self, tmp_path):
+        engine = create_async_engine(f"sqlite+aiosqlite:///{tmp_path / 'wallets.db'}")
+        try:
+            async with engine.begin() as connection:
+                await connection.run_sync(Base.metadata.create_all)
+                await connection.execute(
+                    Wallet.__table__.insert(),
+                    [{"id": uuid.uuid4(), "balance": index} for index in range(100)],
+                )
+
+            paths = await export_to_files(
+                {"default": engine}, tmp_path / "wallets.csv", ExportFormat.CSV,
+                compress=True, parallel=4, chunk_size=16,
+            )
+        finally:
+            await engine.dispose()
+
+        assert len(paths) == 4
+        rows = []
+        for path in paths:
+            lines = gzip.decompress(path.read_bytes()).decode().splitlines()
+            assert lines[0] == "wallet_uuid,balance"
+            rows.extend(lines[1:])
+        assert len(rows) == 100
+        assert sorted(int(row.split(",")[1]) for row in rows) == list(range(100))
@@ -0,0 +1,140 @@
+import uuid
+from collections.abc import AsyncGenerator
+
+import pytest
+from httpx import AsyncClient
+from sqlalchemy import text
+from sqlalchemy.ext.asyncio import AsyncSession, create_async_engine
+
+from src.app import app
+from src.core.database import get_db_session
+from src.core.enums import CircuitState, ErrorMessages
+from src.core.exceptions import DatabaseUnavailableError
+from src.core.health import CircuitBreaker, DatabaseHealthMonitor
+from src.core.sharding import ShardRouter
+from src.wallet.services import WalletService
+
+
+class FakeClock:
+    def __init__(self):
+        self.now = 0.0
+
+    def __call__(self) -> float:
+        return self.now
+
+
+class TestCircuitBreaker:
+    """Тесты автомата доступности."""
+
+    def test_opens_after_threshold(self):
+        breaker = CircuitBreaker(failure_threshold=2, reset_timeout=5, clock=FakeClock())
+
+        assert breaker.record_failure() is False
+        assert breaker.allow_request()
+        assert breaker.record_failure() is True
+        assert breaker.state is CircuitState.OPEN
+        assert not breaker.allow_request()
+
+    def test_half_open_probe_restores_traffic(self):
+        clock = FakeClock()
+        breaker = CircuitBreaker(failure_threshold=1, reset_timeout=5, clock=clock)
+        breaker.record_failure()
+
+        clock.now = 3
+        assert not breaker.allow_probe()
+
+        clock.now = 6
+        assert breaker.allow_probe()
+        assert breaker.state is CircuitState.HALF_OPEN
+        assert not breaker.allow_request()
+
+        assert breaker.record_success() is True
+        assert breaker.allow_request()
+        assert breaker.last_recovery_seconds == 6
+
+    def test_failed_probe_reopens(self):
+        clock = FakeClock()
+        breaker = CircuitBreaker(failure_threshold=1, reset_timeout=5, clock=clock)
+        breaker.record_failure()
+        clock.now = 5
+        breaker.allow_probe()
+
+        breaker.record_failure()
+
+        assert breaker.state is CircuitState.OPEN
+        assert not breaker.allow_probe()
+
+
+class TestDatabaseHealthMonitor:
+    """Тесты фоновой проверки БД."""
+
+    @pytest.mark.asyncio
+    async def test_outage_and_recovery(self, tmp_path):
+        clock = FakeClock()
+        database_dir = tmp_path / "data"
+        engine = create_async_engine(f"sqlite+aiosqlite:///{database_dir / 'wallets.db'}")
+        monitor = DatabaseHealthMonitor(
+            "default", engine, CircuitBreaker(2, 5, clock=clock), interval=1, timeout=1
+        )
+        try:
+            assert await monitor.check() is False
+            assert await monitor.check() is False
+            assert monitor.breaker.state is CircuitState.OPEN
+
+            database_dir.mkdir()
+            clock.now = 2
+            assert await monitor.check() is False
+            assert monitor.checks == 2
+
+            clock.now = 7
+            assert await monitor.check() is True
+            assert monitor.breaker.state is CircuitState.CLOSED
+            assert monitor.breaker.last_recovery_seconds == 7
+        finally:
+            await engine.dispose()
+
+    @pytest.mark.asyncio
+    async def test_counts_skipped_pre_pings(self, tmp_path):
+        engine = create_async_engine(f"sqlite+aiosqlite:///{tmp_path / 'wallets.db'}")
+        monitor = DatabaseHealthMonitor(
+            "default", engine, CircuitBreaker(2, 5), interval=1, timeout=1, replaces_pre_ping=True
+        )
+        try:
+            await monitor.check()
+            for _ in range(3):
+                async with engine.connect() as connection:
+                    await connection.execute(text("SELECT 1"))
+
+            assert monitor.skipped_pre_pings == 3
+            assert monitor.ping_seconds is not None
+            assert monitor.estimated_saved_seconds > 0
+        finally:
+            await engine.dispose()
+
+
+class TestFailFast:
+    """Тесты отказа без ожидания пула при недоступной БД."""
+
+    @pytest.mark.asyncio
+    async def test_router_rejects_unavailable_shard(self, tmp_path):
+        engine = create_async_engine(f"sqlite+aiosqlite:///{tmp_path / 'wallets.db'}")
+        router = ShardRouter(["a"], is_available=lambda shard_id: False)
+        try:
+            async with router.session_factory({"a": engine})() as session:
+                with pytest.raises(DatabaseUnavailableError):
+                    await WalletService(session).get_wallet(uuid.uuid4())
+        finally:
+            await engine.dispose()
+
+    @pytest.mark.asyncio
+    async def test_unavailable_database_returns_503(self, client: AsyncClient):
+        async def unavailable_db_session() -> AsyncGenerator[AsyncSession, None]:
+            raise DatabaseUnavailableError()
+            yield
+
+        app.dependency_overrides[get_db_session] = unavailable_db_session
+
+        response = await client.get(f"/api/v1/wallets/{uuid.uuid4()}")
+
+        assert response.status_code == 503
+        assert response.json()["detail"] == ErrorMessages.SERVICE_UNAVAILABLE
@@ -0,0 +1,107 @@
+import uuid
+
+import pytest
+from httpx import AsyncClient
+
+from src.core.config import settings
+from src.core.enums import OperationType
+from src.wallet.hotkeys import HotWalletTracker, SpaceSaving
+from src.wallet.models import Wallet
+
+
+class FakeClock:
+    def __init__(self):
+        self.now = 0.0
+
+    def __call__(self) -> float:
+        return self.now
+
+
+class TestSpaceSaving:
+    """Тесты счетчика heavy hitters."""
+
+    def test_memory_is_bounded(self):
+        sketch = SpaceSaving(capacity=8)
+        for _ in range(1000):
+            sketch.add(uuid.uuid4())
+
+        assert len(sketch.counts) == 8
+
+    def test_heavy_hitter_survives_noise(self):
+        sketch = SpaceSaving(capacity=8)
+        hot = uuid.uuid4()
+        for index in range(1000):
+            sketch.add(hot if index % 3 == 0 else uuid.uuid4())
+
+        assert max(sketch.counts, key=sketch.counts.__getitem__) == hot
+        assert sketch.counts[hot] >= 334
+
+
+class TestHotWalletTracker:
+    """Тесты скользящих окон трекера горячих кошельков."""
+
+    def test_window_excludes_old_buckets(self):
+        clock = FakeClock()
+        tracker = HotWalletTracker(capacity=4, bucket_seconds=10, bucket_count=6, clock=clock)
+        old, recent = uuid.uuid4(), uuid.uuid4()
+
+        for _ in range(5):
+            tracker.record_request(old)
+        clock.now = 40
+        tracker.record_request(recent)
+        tracker.record_lock_wait(recent, 0.25)
+
+        by_requests, by_lock_wait = tracker.top(10, window_seconds=20)
+        assert [item.wallet_uuid for item in by_requests] == [recent]
+        assert by_lock_wait[0].lock_wait_seconds == pytest.approx(0.25)
+
+        by_requests, _ = tracker.top(10, window_seconds=60)
+        assert [item.wallet_uuid for item in by_requests] == [old, recent]
+
+    def test_expired_buckets_are_reused(self):
+        clock = FakeClock()
+        tracker = HotWalletTracker(capacity=4, bucket_seconds=10, bucket_count=3, clock=clock)
+        wallet_uuid = uuid.uuid4()
+
+        tracker.record_request(wallet_uuid)
+        clock.now = 30
+        tracker.record_request(wallet_uuid)
+
+        by_requests, _ = tracker.top(10, window_seconds=30)
+        assert by_requests[0].requests == 1
+
+
+class TestHotWalletsEndpoint:
+    """Тесты admin-эндпоинта горячих кошельков."""
+
+    @pytest.mark.asyncio
+    async def test_requires_admin_token(self, client: AsyncClient, monkeypatch):
+        monkeypatch.setattr(settings, "admin_token", "secret")
+
+        response = await client.get("/api/v1/admin/hot-wallets")
+        assert response.status_code == 403
+
+        response = await client.get("/api/v1/admin/hot-wallets", headers={"X-Admin-Token": "wrong"})
+        assert response.status_code == 403
+
+    @pytest.mark.asyncio
+    async def test_reports_hot_wallet(self, client: AsyncClient, wallet: Wallet, monkeypatch):
+        monkeypatch.setattr(settings, "admin_token", "secret")
+
+        for _ in range(20):
+            await client.post(
+                f"/api/v1/wallets/{wallet.id}/operation",
+                json={"operation_type": OperationType.DEPOSIT, "amount": 1}
+            )
+
+        response = await client.get(
+            "/api/v1/admin/hot-wallets",
+            params={"limit": 1, "window": 60},
+            headers={"X-Admin-Token": "secret"},
+        )
+
+        assert response.status_code == 200
+        body = response.json()
+        assert body["by_requests"][0]["wallet_uuid"] == str(wallet.id)
+        assert body["by_requests"][0]["requests"] >= 20
+        assert body["by_lock_wait"][0]["wallet_uuid"] == str(wallet.id)
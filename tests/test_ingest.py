@@ -0,0 +1,130 @@
+import json
+import uuid
+
+import pytest
+from httpx import AsyncClient
+from sqlalchemy.ext.asyncio import AsyncSession, async_sessionmaker
+
+from src.core.config import settings
+from src.core.enums import ErrorMessages, OperationType
+from src.wallet.ingest import ingest_operations, split_lines
+from src.wallet.models import Wallet
+
+STREAM_URL = "/api/v1/wallets/operations/stream"
+
+
+def _line(wallet_uuid: uuid.UUID, operation_type: OperationType, amount: int) -> str:
+    return json.dumps({"wallet_uuid": str(wallet_uuid), "operation_type": operation_type, "amount": amount})
+
+
+def _parse(response_text: str) -> tuple[list[dict], list[dict]]:
+    items = [json.loads(line) for line in response_text.splitlines()]
+    results = [item for item in items if "line" in item]
+    checkpoints = [item for item in items if "checkpoint" in item]
+    return results, checkpoints
+
+
+async def _body(*chunks: bytes):
+    for chunk in chunks:
+        yield chunk
+
+
+class TestSplitLines:
+    """Тесты разбиения входного потока на строки."""
+
+    @pytest.mark.asyncio
+    async def test_lines_across_chunks(self):
+        lines = [line async for line in split_lines(_body(b"ab", b"c\nde", b"\n\nf"), 16)]
+
+        assert lines == [b"abc", b"de", b"", b"f"]
+
+    @pytest.mark.asyncio
+    async def test_long_line_is_rejected(self):
+        lines = [line async for line in split_lines(_body(b"x" * 10, b"y" * 10, b"\nok\n"), 16)]
+
+        assert lines == [None, b"ok"]
+
+
+class TestOperationsStream:
+    """Тесты потоковой загрузки операций."""
+
+    @pytest.mark.asyncio
+    async def test_results_per_line(self, client: AsyncClient, wallet: Wallet, monkeypatch):
+        monkeypatch.setattr(settings, "ingest_chunk_size", 2)
+        body = "\n".join([
+            _line(wallet.id, OperationType.DEPOSIT, 500),
+            _line(wallet.id, OperationType.WITHDRAW, 5000),
+            "",
+            _line(uuid.uuid4(), OperationType.DEPOSIT, 1),
+            "{not json",
+            _line(wallet.id, OperationType.WITHDRAW, 1500),
+        ]) + "\n"
+
+        response = await client.post(STREAM_URL, content=body)
+
+        assert response.status_code == 200
+        results, checkpoints = _parse(response.text)
+        assert [(r["line"], r["status"]) for r in results] == [
+            (1, "ok"), (2, "error"), (4, "error"), (5, "error"), (6, "ok")
+        ]
+        assert results[0]["balance"] == 1500
+        assert results[1]["detail"] == ErrorMessages.INSUFFICIENT_FUNDS
+        assert results[2]["detail"] == ErrorMessages.WALLET_NOT_FOUND
+        assert results[3]["detail"] == ErrorMessages.INVALID_REQUEST_DATA
+        assert results[4]["balance"] == 0
+        assert [c["lines_committed"] for c in checkpoints] == [0, 2, 4, 6]
+
+        response = await client.get(f"/api/v1/wallets/{wallet.id}")
+        assert response.json()["balance"] == 0
+
+    @pytest.mark.asyncio
+    async def test_per_wallet_order_preserved(self, client: AsyncClient, empty_wallet: Wallet, wallet: Wallet):
+        body = "\n".join([
+            _line(empty_wallet.id, OperationType.DEPOSIT, 100),
+            _line(wallet.id, OperationType.WITHDRAW, 1000),
+            _line(empty_wallet.id, OperationType.WITHDRAW, 100),
+            _line(wallet.id, OperationType.DEPOSIT, 1),
+        ])
+
+        response = await client.post(STREAM_URL, content=body)
+
+        results, _ = _parse(response.text)
+        assert [r["status"] for r in results] == ["ok"] * 4
+        assert [r["balance"] for r in results] == [100, 0, 0, 1]
+
+    @pytest.mark.asyncio
+    async def test_resume_after_broken_upload(
+        self, client: AsyncClient, db_session: AsyncSession, empty_wallet: Wallet
+    ):
+        lines = [_line(empty_wallet.id, OperationType.DEPOSIT, 10 ** index) for index in range(4)]
+
+        async def broken_body():
+            yield ("\n".join(lines[:2]) + "\n").encode()
+            raise ConnectionError("client disconnected")
+
+        upload_id = uuid.uuid4()
+        received = []
+        with pytest.raises(ConnectionError):
+            async for data in ingest_operations(
+                async_sessionmaker(db_session.bind, expire_on_commit=False),
+                broken_body(), upload_id, chunk_size=2, max_line_bytes=1024,
+            ):
+                received.append(json.loads(data))
+        token = received[-1]["checkpoint"]
+        assert received[-1]["lines_committed"] == 2
+
+        response = await client.post(STREAM_URL, params={"checkpoint": token}, content="\n".join(lines))
+
+        results, checkpoints = _parse(response.text)
+        assert [r["line"] for r in results] == [3, 4]
+        assert checkpoints[-1]["lines_committed"] == 4
+
+        response = await client.get(f"/api/v1/wallets/{empty_wallet.id}")
+        assert response.json()["balance"] == 1111
+
+    @pytest.mark.asyncio
+    async def test_invalid_checkpoint(self, client: AsyncClient):
+        response = await client.post(STREAM_URL, params={"checkpoint": "garbage"}, content="")
+
+        assert response.status_code == 400
+        assert response.json()["detail"] == ErrorMessages.INVALID_CHECKPOINT
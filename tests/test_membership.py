@@ -0,0 +1,89 @@
+import uuid
+from collections.abc import AsyncGenerator
+
+import pytest
+import pytest_asyncio
+from httpx import AsyncClient
+from sqlalchemy.ext.asyncio import AsyncSession
+
+from src.core.config import settings
+from src.core.enums import ErrorMessages, OperationType
+from src.wallet.membership import BloomFilter, wallet_membership
+from src.wallet.models import Wallet
+
+
+@pytest_asyncio.fixture
+async def membership_filter(db_session: AsyncSession) -> AsyncGenerator[None, None]:
+    await wallet_membership.rebuild({"default": db_session.bind})
+    yield
+    wallet_membership.clear()
+
+
+class TestBloomFilter:
+    """Тесты фильтра Блума."""
+
+    def test_no_false_negatives(self):
+        bloom = BloomFilter(capacity=1000, error_rate=0.01)
+        wallet_ids = [uuid.uuid4() for _ in range(1000)]
+        for wallet_id in wallet_ids:
+            bloom.add(wallet_id)
+
+        assert all(wallet_id in bloom for wallet_id in wallet_ids)
+
+    def test_false_positive_rate_is_bounded(self):
+        bloom = BloomFilter(capacity=1000, error_rate=0.01)
+        for _ in range(1000):
+            bloom.add(uuid.uuid4())
+
+        false_positives = sum(uuid.uuid4() in bloom for _ in range(10000))
+
+        assert false_positives / 10000 < 0.03
+        assert bloom.false_positive_rate == pytest.approx(0.01, rel=0.5)
+
+
+class TestWalletMembership:
+    """Тесты отсечения несуществующих кошельков."""
+
+    @pytest.mark.asyncio
+    async def test_unknown_wallet_rejected_before_db(self, client: AsyncClient, membership_filter):
+        rejected = wallet_membership.rejected
+
+        response = await client.post(
+            f"/api/v1/wallets/{uuid.uuid4()}/operation",
+            json={"operation_type": OperationType.DEPOSIT, "amount": 100}
+        )
+
+        assert response.status_code == 404
+        assert response.json()["detail"] == ErrorMessages.WALLET_NOT_FOUND
+        assert wallet_membership.rejected == rejected + 1
+
+    @pytest.mark.asyncio
+    async def test_existing_wallet_passes(self, client: AsyncClient, wallet: Wallet, membership_filter):
+        response = await client.get(f"/api/v1/wallets/{wallet.id}")
+
+        assert response.status_code == 200
+
+    @pytest.mark.asyncio
+    async def test_created_wallet_added_to_filter(
+        self, client: AsyncClient, db_session: AsyncSession, membership_filter
+    ):
+        created = Wallet(balance=10)
+        db_session.add(created)
+        await db_session.commit()
+
+        response = await client.get(f"/api/v1/wallets/{created.id}")
+
+        assert response.status_code == 200
+
+    @pytest.mark.asyncio
+    async def test_stats_endpoint(self, client: AsyncClient, wallet: Wallet, membership_filter, monkeypatch):
+        monkeypatch.setattr(settings, "admin_token", "secret")
+
+        response = await client.get("/api/v1/admin/membership-filter", headers={"X-Admin-Token": "secret"})
+
+        assert response.status_code == 200
+        body = response.json()
+        assert body["ready"] is True
+        assert body["items"] >= 1
+        assert body["memory_bytes"] > 0
+        assert 0 < body["false_positive_rate"] < settings.membership_filter_error_rate
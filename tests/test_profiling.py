@@ -0,0 +1,66 @@
+import re
+
+import pytest
+from httpx import AsyncClient
+from sqlalchemy.ext.asyncio import AsyncSession
+
+from src.core.config import settings
+from src.core.enums import OperationType
+from src.core.profiling import instrument_engine
+from src.wallet.models import Wallet
+
+
+def _timing(header: str, name: str) -> str:
+    return next(part.strip() for part in header.split(",") if part.strip().startswith(name + ";"))
+
+
+class TestServerTiming:
+    """Тесты учета времени запроса."""
+
+    @pytest.mark.asyncio
+    async def test_server_timing_reports_db_round_trips(
+        self, client: AsyncClient, db_session: AsyncSession, wallet: Wallet
+    ):
+        instrument_engine(db_session.bind)
+
+        response = await client.post(
+            f"/api/v1/wallets/{wallet.id}/operation",
+            json={"operation_type": OperationType.DEPOSIT, "amount": 1}
+        )
+
+        assert response.status_code == 200
+        header = response.headers["server-timing"]
+        round_trips = int(re.search(r'desc="(\d+) round trips"', _timing(header, "db")).group(1))
+        assert round_trips >= 2
+        for name in ("lock", "app", "total"):
+            assert re.fullmatch(rf"{name};dur=\d+\.\d+", _timing(header, name))
+
+    @pytest.mark.asyncio
+    async def test_header_on_validation_error(self, client: AsyncClient):
+        response = await client.get("/api/v1/wallets/not-a-uuid")
+
+        assert response.status_code == 422
+        assert "total;dur=" in response.headers["server-timing"]
+
+
+class TestSampledProfiling:
+    """Тесты профилирования по запросу."""
+
+    @pytest.mark.asyncio
+    async def test_profile_written_for_admin_header(self, client: AsyncClient, wallet: Wallet, tmp_path, monkeypatch):
+        monkeypatch.setattr(settings, "admin_token", "secret")
+        monkeypatch.setattr(settings, "profiling_dir", str(tmp_path))
+
+        response = await client.get(f"/api/v1/wallets/{wallet.id}", headers={"X-Profile": "secret"})
+
+        assert response.status_code == 200
+        assert len(list(tmp_path.glob("*.prof"))) == 1
+
+    @pytest.mark.asyncio
+    async def test_no_profile_without_token(self, client: AsyncClient, wallet: Wallet, tmp_path, monkeypatch):
+        monkeypatch.setattr(settings, "admin_token", "secret")
+        monkeypatch.setattr(settings, "profiling_dir", str(tmp_path))
+
+        await client.get(f"/api/v1/wallets/{wallet.id}", headers={"X-Profile": "wrong"})
+
+        assert list(tmp_path.glob("*.prof")) == []
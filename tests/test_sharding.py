@@ -0,0 +1,139 @@
+import uuid
+from collections import Counter
+from collections.abc import AsyncGenerator
+
+import pytest
+import pytest_asyncio
+from sqlalchemy import select
+from sqlalchemy.ext.asyncio import AsyncEngine, create_async_engine
+
+from src.core.sharding import HashRing, ShardRouter
+from src.wallet.models import Base, Wallet
+from src.wallet.resharding import reshard
+from src.wallet.services import WalletService
+
+
+@pytest_asyncio.fixture
+async def shard_engines(tmp_path) -> AsyncGenerator[dict[str, AsyncEngine], None]:
+    engines = {
+        shard_id: create_async_engine(f"sqlite+aiosqlite:///{tmp_path / shard_id}.db")
+        for shard_id in ("a", "b", "c")
+    }
+    for engine in engines.values():
+        async with engine.begin() as connection:
+            await connection.run_sync(Base.metadata.create_all)
+
+    yield engines
+
+    for engine in engines.values():
+        await engine.dispose()
+
+
+async def _stored_ids(engine: AsyncEngine) -> set[uuid.UUID]:
+    async with engine.connect() as connection:
+        return set((await connection.execute(select(Wallet.id))).scalars())
+
+
+class TestHashRing:
+    """Тесты консистентного хеш-кольца."""
+
+    def test_distribution_is_balanced(self):
+        ring = HashRing(["a", "b", "c"], vnodes=128)
+        counts = Counter(ring.shard_for(uuid.uuid4()) for _ in range(6000))
+
+        assert set(counts) == {"a", "b", "c"}
+        assert all(count > 1500 for count in counts.values())
+
+    def test_adding_shard_moves_only_its_share(self):
+        before = HashRing(["a", "b"], vnodes=128)
+        after = HashRing(["a", "b", "c"], vnodes=128)
+        wallet_ids = [uuid.uuid4() for _ in range(3000)]
+
+        moved = [w for w in wallet_ids if before.shard_for(w) != after.shard_for(w)]
+
+        assert all(after.shard_for(w) == "c" for w in moved)
+        assert len(moved) < len(wallet_ids) / 2
+
+    def test_router_rejects_unknown_previous_shard(self):
+        with pytest.raises(ValueError):
+            ShardRouter(["a", "b"], previous_shard_ids=["x"])
+
+
+class TestShardedSession:
+    """Тесты прозрачной маршрутизации WalletService по шардам."""
+
+    @pytest.mark.asyncio
+    async def test_wallets_are_stored_on_owner_shard(self, shard_engines):
+        router = ShardRouter(shard_engines)
+        session_factory = router.session_factory(shard_engines)
+
+        async with session_factory() as session:
+            wallets = [Wallet(balance=100) for _ in range(30)]
+            session.add_all(wallets)
+            await session.commit()
+
+        for shard_id, engine in shard_engines.items():
+            expected = {w.id for w in wallets if router.shard_for(w.id) == shard_id}
+            assert await _stored_ids(engine) == expected
+
+    @pytest.mark.asyncio
+    async def test_service_operations_are_routed(self, shard_engines):
+        router = ShardRouter(shard_engines)
+        session_factory = router.session_factory(shard_engines)
+
+        async with session_factory() as session:
+            wallets = [Wallet(balance=100) for _ in range(10)]
+            session.add_all(wallets)
+            await session.commit()
+
+        for wallet in wallets:
+            async with session_factory() as session:
+                service = WalletService(session)
+                await service.deposit(wallet.id, 50)
+                await service.withdraw(wallet.id, 30)
+
+            async with session_factory() as session:
+                assert (await WalletService(session).get_wallet(wallet.id)).balance == 120
+
+
+class TestResharding:
+    """Тесты переноса кошельков при добавлении шардов."""
+
+    @pytest.mark.asyncio
+    async def test_reshard_moves_wallets_to_new_owners(self, shard_engines):
+        old_router = ShardRouter(["a"])
+        async with old_router.session_factory(shard_engines)() as session:
+            wallets = [Wallet(balance=index) for index in range(50)]
+            session.add_all(wallets)
+            await session.commit()
+
+        router = ShardRouter(["a", "b", "c"], previous_shard_ids=["a"])
+        session_factory = router.session_factory(shard_engines)
+
+        # Во время миграции кошельки доступны из обоих колец
+        async with session_factory() as session:
+            await WalletService(session).deposit(wallets[0].id, 1000)
+
+        moved = await reshard(shard_engines, router, batch_size=7)
+
+        assert sum(moved.values()) == sum(1 for w in wallets if router.shard_for(w.id) != "a")
+        for shard_id, engine in shard_engines.items():
+            expected = {w.id for w in wallets if router.shard_for(w.id) == shard_id}
+            assert await _stored_ids(engine) == expected
+
+        async with ShardRouter(["a", "b", "c"]).session_factory(shard_engines)() as session:
+            service = WalletService(session)
+            assert (await service.get_wallet(wallets[0].id)).balance == 1000
+            for wallet in wallets[1:]:
+                assert (await service.get_wallet(wallet.id)).balance == wallet.balance
+
+    @pytest.mark.asyncio
+    async def test_reshard_is_idempotent(self, shard_engines):
+        router = ShardRouter(["a", "b"], previous_shard_ids=["a"])
+        async with ShardRouter(["a"]).session_factory(shard_engines)() as session:
+            session.add_all(Wallet(balance=1) for _ in range(20))
+            await session.commit()
+
+        await reshard(shard_engines, router)
+
+        assert sum((await reshard(shard_engines, router)).values()) == 0